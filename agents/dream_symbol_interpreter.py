@@ -7,6 +7,37 @@ from ..core.llm_service import llm_service
 
 logger = logging.getLogger("DreamSymbolInterpreterAgent")
 
+# قالب الـ prompt ثابت، يُبنى مرة واحدة وتُملأ حقوله فقط عند كل استدعاء
+_ANALYSIS_PROMPT_TEMPLATE = """
+مهمتك: أنت محلل نفسي خبير في تفسير الأحلام والرموز، متخصص في مدرسة "كارل يونغ" للنماذج الأصلية (Archetypes) واللاوعي الجمعي.
+
+**الشخصية الحالمة:**
+- **الاسم:** {name}
+- **ملفها النفسي:** الدافع الأساسي هو '{motivation}', والجرح النفسي هو '{wound}'.
+
+**نص الحلم للتحليل:**
+---
+{dream}
+---
+
+**المطلوب:**
+بناءً على الحلم وملف الشخصية، قدم تحليلاً نفسياً ورمزياً عميقاً. أرجع ردك **حصريًا** بتنسيق JSON.
+1.  **symbols_interpretation:** حدد أهم 3 رموز في الحلم وفسر معناها في سياق حالة الشخصية النفسية.
+2.  **narrative_function:** اشرح الوظيفة الدرامية لهذا الحلم في القصة. ماذا يكشف؟ ماذا ينذر؟
+3.  **jungian_archetype:** حدد النموذج الأصلي (حسب يونغ) الذي يظهر في هذا الحلم (مثال: الظل 'The Shadow'، الحكيم 'The Wise Old Man'، القناع 'The Persona').
+
+**التحليل (JSON):**
+{{
+  "symbols_interpretation": [
+    {{"symbol": "string", "meaning": "string"}},
+    {{"symbol": "string", "meaning": "string"}},
+    {{"symbol": "string", "meaning": "string"}}
+  ],
+  "narrative_function": "string",
+  "jungian_archetype": "string"
+}}
+"""
+
 class DreamSymbolInterpreterAgent(BaseAgent):
     """
     وكيل مفسر الأحلام والرموز (V2).
@@ -49,35 +80,12 @@ class DreamSymbolInterpreterAgent(BaseAgent):
         }
         
     def _build_analysis_prompt(self, dream: str, profile: Dict) -> str:
-        return f"""
-مهمتك: أنت محلل نفسي خبير في تفسير الأحلام والرموز، متخصص في مدرسة "كارل يونغ" للنماذج الأصلية (Archetypes) واللاوعي الجمعي.
-
-**الشخصية الحالمة:**
-- **الاسم:** {profile.get('name')}
-- **ملفها النفسي:** الدافع الأساسي هو '{profile.get('core_motivation')}', والجرح النفسي هو '{profile.get('psychological_wound')}'.
-
-**نص الحلم للتحليل:**
----
-{dream}
----
-
-**المطلوب:**
-بناءً على الحلم وملف الشخصية، قدم تحليلاً نفسياً ورمزياً عميقاً. أرجع ردك **حصريًا** بتنسيق JSON.
-1.  **symbols_interpretation:** حدد أهم 3 رموز في الحلم وفسر معناها في سياق حالة الشخصية النفسية.
-2.  **narrative_function:** اشرح الوظيفة الدرامية لهذا الحلم في القصة. ماذا يكشف؟ ماذا ينذر؟
-3.  **jungian_archetype:** حدد النموذج الأصلي (حسب يونغ) الذي يظهر في هذا الحلم (مثال: الظل 'The Shadow'، الحكيم 'The Wise Old Man'، القناع 'The Persona').
-
-**التحليل (JSON):**
-{{
-  "symbols_interpretation": [
-    {{"symbol": "string", "meaning": "string"}},
-    {{"symbol": "string", "meaning": "string"}},
-    {{"symbol": "string", "meaning": "string"}}
-  ],
-  "narrative_function": "string",
-  "jungian_archetype": "string"
-}}
-"""
+        return _ANALYSIS_PROMPT_TEMPLATE.format(
+            name=profile.get('name'),
+            motivation=profile.get('core_motivation'),
+            wound=profile.get('psychological_wound'),
+            dream=dream
+        )
 
     async def process_task(self, context: Dict[str, Any], **kwargs) -> Dict[str, Any]:
         return await self.generate_symbolic_dream_analysis(context)
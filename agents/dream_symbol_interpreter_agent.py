@@ -7,6 +7,23 @@ from ..core.llm_service import llm_service
 
 logger = logging.getLogger("DreamSymbolInterpreterAgent")
 
+# قالب الـ prompt ثابت، يُبنى مرة واحدة وتُملأ حقوله فقط عند كل استدعاء
+_METAPHOR_PROMPT_TEMPLATE = """
+مهمتك: أنت شاعر و فيلسوف. مهمتك ليست كتابة أغنية، بل خلق **الصورة الشعرية المركزية (Central Metaphor)** التي ستكون قلب الأغنية.
+
+**الموضوع:** {topic}
+**روح الفنان:** يميل إلى مواضيع {core_themes}، ويستخدم رموزًا مثل {key_symbols}.
+
+**المطلوب:**
+ابتكر صورة شعرية واحدة، ملموسة، ومبتكرة لتجسيد هذا الموضوع. يجب أن تكون الصورة قابلة للتطور داخل الأغنية.
+أرجع ردك **حصريًا** بتنسيق JSON.
+{{
+  "metaphor_object": "string // الشيء المادي الذي يمثل الرمز (مثال: 'مفتاح صدئ').",
+  "metaphor_meaning": "string // المعنى العميق لهذا الرمز (مثال: 'يمثل الأمل المفقود والذكريات التي لا يمكن الوصول إليها').",
+  "sensory_details": ["string"] // قائمة بتفاصيل حسية مرتبطة بالرمز (مثال: 'ملمسه بارد'، 'رائحته كرائحة التراب القديم').
+}}
+"""
+
 class DreamSymbolInterpreterAgent(BaseAgent):
     """
     وكيل مفسر الأحلام والرموز (V2).
@@ -49,21 +66,11 @@ class DreamSymbolInterpreterAgent(BaseAgent):
         }
         
     def _build_metaphor_prompt(self, topic: str, profile: Dict) -> str:
-        return f"""
-مهمتك: أنت شاعر و فيلسوف. مهمتك ليست كتابة أغنية، بل خلق **الصورة الشعرية المركزية (Central Metaphor)** التي ستكون قلب الأغنية.
-
-**الموضوع:** {topic}
-**روح الفنان:** يميل إلى مواضيع {profile.get('core_themes', [])}، ويستخدم رموزًا مثل {profile.get('symbolic_lexicon', {}).get('key_symbols', [])}.
-
-**المطلوب:**
-ابتكر صورة شعرية واحدة، ملموسة، ومبتكرة لتجسيد هذا الموضوع. يجب أن تكون الصورة قابلة للتطور داخل الأغنية.
-أرجع ردك **حصريًا** بتنسيق JSON.
-{{
-  "metaphor_object": "string // الشيء المادي الذي يمثل الرمز (مثال: 'مفتاح صدئ').",
-  "metaphor_meaning": "string // المعنى العميق لهذا الرمز (مثال: 'يمثل الأمل المفقود والذكريات التي لا يمكن الوصول إليها').",
-  "sensory_details": ["string"] // قائمة بتفاصيل حسية مرتبطة بالرمز (مثال: 'ملمسه بارد'، 'رائحته كرائحة التراب القديم').
-}}
-"""
+        return _METAPHOR_PROMPT_TEMPLATE.format(
+            topic=topic,
+            core_themes=profile.get('core_themes', []),
+            key_symbols=profile.get('symbolic_lexicon', {}).get('key_symbols', [])
+        )
 
     async def process_task(self, context: Dict[str, Any], **kwargs) -> Dict[str, Any]:
         # تم تعديل المهمة الافتراضية لتكون توليد الاستعارة
@@ -1,6 +1,6 @@
 # agents/educational_content_critic.py
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
 from .base_agent import BaseAgent
 
@@ -37,8 +37,7 @@ class EducationalContentCritic(BaseAgent):
             issues.append("الهيكل يفتقر إلى وحدات كافية لتغطية الموضوع بعمق.")
         
         # تقييم تنوع الأنشطة
-        all_activities = [activity for unit in curriculum_map.get("units", []) for activity in unit.get("activities", [])]
-        if len(set(all_activities)) < 2:
+        if not self._has_distinct_activities(curriculum_map.get("units", []), minimum=2):
             score -= 1.0
             issues.append("الأنشطة المقترحة غير متنوعة، مما قد يسبب الملل.")
             
@@ -47,3 +46,14 @@ class EducationalContentCritic(BaseAgent):
             "issues": issues,
             "summary": f"التقييم التربوي: {max(min(score, 10.0), 0.0):.1f}/10."
         }
+
+    @staticmethod
+    def _has_distinct_activities(units: List[Dict[str, Any]], minimum: int) -> bool:
+        """يتحقق من وجود عدد أدنى من الأنشطة المختلفة، ويتوقف بمجرد بلوغه."""
+        seen = set()
+        for unit in units:
+            for activity in unit.get("activities", ()):
+                seen.add(activity)
+                if len(seen) >= minimum:
+                    return True
+        return False
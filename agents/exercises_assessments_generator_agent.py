@@ -1,12 +1,60 @@
 # agents/exercises_assessments_generator_agent.py (وكيل جديد)
+import asyncio
 import logging
-from typing import Dict, Any, Optional, List
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Tuple
 
 from .base_agent import BaseAgent
 from ..core.llm_service import llm_service
+from ..core.llm_cache import ResponseCache, content_digest, llm_singleflight, request_key
+from ..core.concurrency import LoopBoundSemaphore
 
 logger = logging.getLogger("ExercisesAssessmentsGeneratorAgent")
 
+_DIFFICULTY_LEVELS = ("easy", "medium", "hard")
+
+# سقف للطلبات الاستباقية حتى لا تزاحم الطلبات التفاعلية على LLM
+_PREFETCH_SEMAPHORE = LoopBoundSemaphore(2)
+
+_TYPE_DESCRIPTIONS = {
+    "comprehension": "أسئلة فهم مباشر (من هو؟ ماذا؟ عرّف...).",
+    "analysis": "أسئلة تحليل ومقارنة (لماذا؟ كيف؟ قارن بين...).",
+    "mcq": "أسئلة اختيار من متعدد مع 3 خيارات خاطئة وخيار واحد صحيح.",
+    "application": "أسئلة تطبيقية (اكتب فقرة تطبق فيها المفهوم...)."
+}
+
+_GENERATION_PROMPT_TEMPLATE = """
+مهمتك: أنت أستاذ وخبير في تصميم التمارين والتقييمات التربوية لمادة الفلسفة والتاريخ لطلاب البكالوريا في تونس.
+
+**المطلوب:**
+بناءً على محتوى الدرس الوارد في آخر هذه الرسالة، قم بتوليد مجموعة من التمارين والأسئلة بمستوى الصعوبة والأنواع المحددة معه.
+
+أرجع ردك **حصريًا** بتنسيق JSON. يجب أن يحتوي الرد على مفتاح واحد هو "exercises"، وقيمته قائمة (list) من الكائنات (objects).
+كل كائن في القائمة يجب أن يتبع الهيكل التالي:
+{{
+  "question": "string // نص السؤال بوضوح.",
+  "type": "string // نوع السؤال (مثال: 'فهم'، 'تحليل'، 'اختيار من متعدد').",
+  "difficulty": "string // مستوى صعوبة السؤال (سهل، متوسط، صعب).",
+  "options": ["string"] // (اختياري) قائمة الخيارات لأسئلة الاختيار من متعدد.,
+  "correct_answer": "string // (اختياري) الإجابة الصحيحة لأسئلة الاختيار من متعدد.",
+  "guidance_answer": "string // إرشادات أو نقاط أساسية للإجابة على الأسئلة المفتوحة."
+}}
+
+- **مستوى الصعوبة المطلوب:** {difficulty}
+- **أنواع التمارين المطلوبة:** {types}
+
+**محتوى الدرس للتحليل:**
+---
+العنوان: {title}
+المحتوى: {content}
+---
+"""
+
+@lru_cache(maxsize=64)
+def _describe_exercise_types(types: Tuple[str, ...]) -> str:
+    """يحول أنواع التمارين المطلوبة إلى وصفها النصي (المستدعون يكررون نفس التركيبات عادةً)."""
+    return ', '.join(_TYPE_DESCRIPTIONS[t] for t in types if t in _TYPE_DESCRIPTIONS)
+
 class ExercisesAssessmentsGeneratorAgent(BaseAgent):
     """
     وكيل "مولّد التمارين والتقييمات".
@@ -18,6 +66,10 @@ class ExercisesAssessmentsGeneratorAgent(BaseAgent):
             name="مولّد التمارين والتقييمات",
             description="يصمم أسئلة متنوعة (فهم، تحليل، اختيار من متعدد) بناءً على محتوى درس معين."
         )
+        # الدروس المكررة (أو التي لا تختلف إلا في التنسيق) لا تستدعي LLM مرة ثانية
+        self._response_cache = ResponseCache(max_entries=10000, ttl=24 * 3600)
+        # مراجع للمهام الاستباقية الجارية حتى لا تُجمع قبل انتهائها
+        self._prefetch_tasks = set()
 
     async def generate_exercises_for_lesson(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -38,13 +90,24 @@ class ExercisesAssessmentsGeneratorAgent(BaseAgent):
 
         logger.info(f"Generating '{difficulty}' level exercises for lesson: '{lesson_title}'")
 
-        prompt = self._build_generation_prompt(lesson_content, lesson_title, exercise_types, difficulty)
-        
-        # هذا النوع من المهام يستفيد من مخرجات JSON المنظمة
-        response = await llm_service.generate_json_response(prompt, temperature=0.5)
+        cache_key = self._cache_key(lesson_content, lesson_title, exercise_types, difficulty)
+        response = self._response_cache.get(cache_key)
+        if response is not None:
+            logger.info(f"Cache hit for lesson: '{lesson_title}'")
+        else:
+            response = await self._request_exercises(lesson_content, lesson_title, exercise_types, difficulty)
 
-        if "error" in response:
-            return {"status": "error", "message": "Failed to generate exercises from LLM.", "details": response}
+            if "error" in response:
+                return {"status": "error", "message": "Failed to generate exercises from LLM.", "details": response}
+            self._response_cache.set(cache_key, response)
+
+            # المعلم الذي يطلب مستوى صعوبة سيطلب غالبًا المستويين الآخرين للدرس نفسه
+            if difficulty in _DIFFICULTY_LEVELS:
+                task = asyncio.create_task(
+                    self._prefetch_other_difficulties(lesson_content, lesson_title, exercise_types, difficulty)
+                )
+                self._prefetch_tasks.add(task)
+                task.add_done_callback(self._prefetch_tasks.discard)
         
         return {
             "status": "success",
@@ -52,42 +115,44 @@ class ExercisesAssessmentsGeneratorAgent(BaseAgent):
             "summary": f"Generated {len(response.get('exercises', []))} exercises for the lesson."
         }
 
-    def _build_generation_prompt(self, content: str, title: str, types: List[str], difficulty: str) -> str:
-        
-        type_descriptions = {
-            "comprehension": "أسئلة فهم مباشر (من هو؟ ماذا؟ عرّف...).",
-            "analysis": "أسئلة تحليل ومقارنة (لماذا؟ كيف؟ قارن بين...).",
-            "mcq": "أسئلة اختيار من متعدد مع 3 خيارات خاطئة وخيار واحد صحيح.",
-            "application": "أسئلة تطبيقية (اكتب فقرة تطبق فيها المفهوم...)."
-        }
-        
-        requested_types = [type_descriptions[t] for t in types if t in type_descriptions]
-        
-        return f"""
-مهمتك: أنت أستاذ وخبير في تصميم التمارين والتقييمات التربوية لمادة الفلسفة والتاريخ لطلاب البكالوريا في تونس.
+    @staticmethod
+    def _cache_key(content: str, title: str, types: List[str], difficulty: str) -> Tuple:
+        return (title, difficulty, tuple(sorted(types)), content_digest(content))
 
-**محتوى الدرس للتحليل:**
----
-العنوان: {title}
-المحتوى: {content}
----
+    async def _request_exercises(self, content: str, title: str, types: List[str], difficulty: str) -> Dict[str, Any]:
+        prompt = self._build_generation_prompt(content, title, types, difficulty)
+        
+        # هذا النوع من المهام يستفيد من مخرجات JSON المنظمة
+        return await llm_singleflight.do(
+            request_key(prompt, 0.5),
+            lambda: llm_service.generate_json_response(prompt, temperature=0.5)
+        )
 
-**المطلوب:**
-بناءً على محتوى الدرس أعلاه، قم بتوليد مجموعة من التمارين والأسئلة.
-- **مستوى الصعوبة المطلوب:** {difficulty}
-- **أنواع التمارين المطلوبة:** {', '.join(requested_types)}
+    async def _prefetch_other_difficulties(self, content: str, title: str, types: List[str], current_difficulty: str):
+        """يولد مسبقًا تمارين المستويات الأخرى ويخزنها فقط (دون إرجاعها)."""
+        for difficulty in _DIFFICULTY_LEVELS:
+            if difficulty == current_difficulty:
+                continue
+            cache_key = self._cache_key(content, title, types, difficulty)
+            if cache_key in self._response_cache:
+                continue
+            try:
+                async with _PREFETCH_SEMAPHORE:
+                    response = await self._request_exercises(content, title, types, difficulty)
+            except Exception as e:
+                logger.warning(f"Prefetch of '{difficulty}' exercises for '{title}' failed: {e}")
+                continue
+            if "error" not in response:
+                self._response_cache.set(cache_key, response, low_priority=True)
 
-أرجع ردك **حصريًا** بتنسيق JSON. يجب أن يحتوي الرد على مفتاح واحد هو "exercises"، وقيمته قائمة (list) من الكائنات (objects).
-كل كائن في القائمة يجب أن يتبع الهيكل التالي:
-{{
-  "question": "string // نص السؤال بوضوح.",
-  "type": "string // نوع السؤال (مثال: 'فهم'، 'تحليل'، 'اختيار من متعدد').",
-  "difficulty": "string // مستوى صعوبة السؤال (سهل، متوسط، صعب).",
-  "options": ["string"] // (اختياري) قائمة الخيارات لأسئلة الاختيار من متعدد.,
-  "correct_answer": "string // (اختياري) الإجابة الصحيحة لأسئلة الاختيار من متعدد.",
-  "guidance_answer": "string // إرشادات أو نقاط أساسية للإجابة على الأسئلة المفتوحة."
-}}
-"""
+    def _build_generation_prompt(self, content: str, title: str, types: List[str], difficulty: str) -> str:
+        return _GENERATION_PROMPT_TEMPLATE.format(
+            title=title,
+            content=content,
+            difficulty=difficulty,
+            # نفس الترتيب المستخدم في _cache_key: مفتاح واحد يقابل دائمًا prompt واحدًا
+            types=_describe_exercise_types(tuple(sorted(types)))
+        )
 
     async def process_task(self, context: Dict[str, Any], **kwargs) -> Dict[str, Any]:
         return await self.generate_exercises_for_lesson(context)
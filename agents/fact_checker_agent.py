@@ -1,14 +1,28 @@
 # agents/fact_checker_agent.py (وكيل جديد يدمج الأدوات)
+import asyncio
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, FrozenSet, Tuple
 
 from .base_agent import BaseAgent
 from ..tools.witness_extractor_tool import WitnessExtractorTool # نفترض وجود هذه الأداة
 from ..services.web_search_service import web_inspiration_service # خدمة البحث
 from ..core.llm_service import llm_service
+from ..core.concurrency import LoopBoundSemaphore
+from ..core.arabic_text import KeywordScanner, normalize_arabic
 
 logger = logging.getLogger("FactCheckerAgent")
 
+# قواعد استخلاص الادعاءات: يُستخلص الادعاء عندما تظهر جميع عباراته المحفِّزة في النص
+_CLAIM_RULES: Tuple[Tuple[FrozenSet[str], str], ...] = (
+    (frozenset({"عام 1992", "قانون"}), "تم تمرير قانون بيع الأراضي في تونس عام 1992"),
+)
+
+# العبارات المحفِّزة تُخزن بصيغتها الموحدة لتطابق النص بعد توحيده
+_NORMALIZED_RULES = tuple((frozenset(map(normalize_arabic, triggers)), claim) for triggers, claim in _CLAIM_RULES)
+
+# كل العبارات المحفِّزة في ماسح واحد، فيُمسح النص مرة واحدة مهما زاد عدد القواعد
+_TRIGGER_SCANNER = KeywordScanner({"triggers": frozenset(t for triggers, _ in _NORMALIZED_RULES for t in triggers)})
+
 class FactCheckerAgent(BaseAgent):
     """
     وكيل متخصص في التحقق من الحقائق والمصداقية.
@@ -22,6 +36,8 @@ class FactCheckerAgent(BaseAgent):
         )
         self.extractor = WitnessExtractorTool() # أداة استخلاص الادعاءات
         self.search_service = web_inspiration_service
+        # سقف لعدد عمليات التحقق المتزامنة حتى لا نُغرق خدمة البحث
+        self._verification_semaphore = LoopBoundSemaphore(8)
 
     async def verify_text_credibility(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -39,14 +55,19 @@ class FactCheckerAgent(BaseAgent):
         if not claims:
             return {"status": "success", "content": {"credibility_score": 0.8, "verified_claims": []}, "summary": "No verifiable claims found."}
 
-        # 2. التحقق من كل ادعاء
+        # 2. التحقق من جميع الادعاءات بشكل متوازٍ
+        results = await asyncio.gather(*(self._cross_reference_claim(claim) for claim in claims), return_exceptions=True)
         verified_claims = []
-        for claim in claims:
-            verification_result = await self._cross_reference_claim(claim)
-            verified_claims.append(verification_result)
+        supported_count = 0
+        for claim, result in zip(claims, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Verification failed for claim '{claim}': {result}")
+                result = {"claim": claim, "is_supported": False, "error": str(result)}
+            supported_count += result["is_supported"]
+            verified_claims.append(result)
         
-        # 3. حساب درجة المصداقية الإجمالية
-        overall_score = self._calculate_overall_credibility(verified_claims)
+        # 3. حساب درجة المصداقية الإجمالية (نسبة الادعاءات المدعومة)
+        overall_score = supported_count / len(verified_claims)
 
         return {
             "status": "success",
@@ -57,34 +78,26 @@ class FactCheckerAgent(BaseAgent):
     def _extract_verifiable_claims(self, text: str) -> List[str]:
         """(محاكاة) يستخلص الادعاءات التي يمكن التحقق منها."""
         # مثال: "في عام 1992، تم تمرير قانون يسمح ببيع الأراضي"
-        claims = []
-        if "عام 1992" in text and "قانون" in text:
-            claims.append("تم تمرير قانون بيع الأراضي في تونس عام 1992")
-        return claims
+        hits, _, _ = _TRIGGER_SCANNER.scan(normalize_arabic(text))
+        return [claim for triggers, claim in _NORMALIZED_RULES if triggers <= hits.keys()]
 
     async def _cross_reference_claim(self, claim: str) -> Dict:
         """يتحقق من صحة ادعاء واحد عبر البحث."""
-        logger.info(f"Cross-referencing claim: '{claim}'")
-        # في نظام حقيقي، سنقوم بالبحث الفعلي
-        # search_results = await self.search_service.search(claim)
-        
-        # محاكاة لنتيجة البحث
-        # لنفترض أننا وجدنا مصدرًا موثوقًا يؤكد الادعاء
-        is_supported = True
-        supporting_sources = ["الرائد الرسمي للجمهورية التونسية، 1992"]
-        
-        return {
-            "claim": claim,
-            "is_supported": is_supported,
-            "supporting_sources": supporting_sources
-        }
-
-    def _calculate_overall_credibility(self, verified_claims: List[Dict]) -> float:
-        if not verified_claims:
-            return 0.8 # درجة افتراضية إذا لم تكن هناك ادعاءات
-        
-        supported_count = sum(1 for claim in verified_claims if claim["is_supported"])
-        return supported_count / len(verified_claims)
+        async with self._verification_semaphore:
+            logger.info(f"Cross-referencing claim: '{claim}'")
+            # في نظام حقيقي، سنقوم بالبحث الفعلي
+            # search_results = await self.search_service.search(claim)
+            
+            # محاكاة لنتيجة البحث
+            # لنفترض أننا وجدنا مصدرًا موثوقًا يؤكد الادعاء
+            is_supported = True
+            supporting_sources = ["الرائد الرسمي للجمهورية التونسية، 1992"]
+            
+            return {
+                "claim": claim,
+                "is_supported": is_supported,
+                "supporting_sources": supporting_sources
+            }
 
     async def process_task(self, context: Dict[str, Any], **kwargs) -> Dict[str, Any]:
         return await self.verify_text_credibility(context)
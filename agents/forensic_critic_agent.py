@@ -1,27 +1,39 @@
 # agents/forensic_critic_agent.py
 # (الكود كما هو في ردنا السابق)
+import asyncio
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 from .base_agent import BaseAgent
 
 logger = logging.getLogger("ForensicCriticAgent")
 
 class ForensicCriticAgent(BaseAgent):
+    # قواعد التقييم: (مفتاح العدّاد في التحليل، الخصم من الدرجة، الملاحظة)
+    _RULES = (
+        ("inconsistencies_count", 2.0, "يوجد تناقضات منطقية."),
+        ("procedural_errors_count", 1.5, "تم اكتشاف أخطاء إجرائية."),
+    )
+
     def __init__(self, agent_id: Optional[str] = None):
         super().__init__(agent_id=agent_id, name="خبير النقد الجنائي", description="مراجعة التحليلات الجنائية لضمان دقتها.")
         logger.info("ForensicCriticAgent initialized.")
         
     def review_forensic_analysis(self, analysis_content: Dict[str, Any]) -> Dict[str, Any]:
         logger.info("Reviewing forensic analysis report...")
-        issues = []
+        issues: List[str] = []
         score = 10.0
         analysis = analysis_content.get("analysis", {})
-        if analysis.get("inconsistencies_count", 0) > 0:
-            score -= 2.0
-            issues.append("يوجد تناقضات منطقية.")
-        if analysis.get("procedural_errors_count", 0) > 0:
-            score -= 1.5
-            issues.append("تم اكتشاف أخطاء إجرائية.")
+        for key, penalty, message in self._RULES:
+            if analysis.get(key, 0) > 0:
+                score -= penalty
+                issues.append(message)
 
         return {"overall_score": max(min(score, 10.0), 0.0), "issues": issues}
+
+    async def review(self, analysis_content: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        نسخة غير متزامنة من review_forensic_analysis تُشغَّل في مجمع الخيوط،
+        حتى لا يُعطِّل التقييم حلقة الأحداث عند استدعائه بالتوازي مع الوكلاء الآخرين.
+        """
+        return await asyncio.get_running_loop().run_in_executor(None, self.review_forensic_analysis, analysis_content)
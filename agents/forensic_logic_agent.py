@@ -4,9 +4,29 @@ from typing import Dict, Any, Optional
 
 from .base_agent import BaseAgent
 from ..core.llm_service import llm_service
+from ..core.llm_cache import ResponseCache, content_digest, llm_singleflight, request_key
 
 logger = logging.getLogger("ForensicLogicAgent")
 
+_ANALYSIS_PROMPT_TEMPLATE = """
+مهمتك: أنت محقق جنائي خبير ومستشار للروائيين. مهمتك هي قراءة النص الذي يصف مشهد جريمة، ثم تقديم تحليل دقيق للمنطق الجنائي والإجرائي.
+
+**التعليمات:**
+قم بتحليل نص المشهد أدناه وأرجع تقريرك **حصريًا** بتنسيق JSON، يغطي النقاط التالية:
+1.  **crime_type:** حدد نوع الجريمة الموصوفة (مثال: "جريمة قتل بآلة حادة"، "سرقة مع اقتحام").
+2.  **evidence_analysis:** حلل الأدلة المذكورة. لكل دليل، اذكر نوعه (مادي، بيولوجي، رقمي) وقيمته المحتملة في التحقيق.
+3.  **procedural_errors:** اذكر أي أخطاء إجرائية واضحة قام بها المحققون في مسرح الجريمة (مثال: "لم يتم تأمين مسرح الجريمة"، "تم لمس الدليل بدون قفازات").
+4.  **logical_inconsistencies:** اذكر أي تناقضات منطقية في المشهد (مثال: "الضحية مصابة بطلق ناري ولكن لا يوجد ذكر لصوت إطلاق نار").
+5.  **recommendations:** قدم توصيتين لتحسين واقعية المشهد الجنائي.
+
+**نص مشهد الجريمة:**
+---
+{scene_text}
+---
+
+**تقرير التحليل الجنائي (JSON):**
+"""
+
 class ForensicLogicAgent(BaseAgent):
     """
     وكيل المنطق الجنائي (V2).
@@ -20,6 +40,7 @@ class ForensicLogicAgent(BaseAgent):
             description="يحلل الدقة الإجرائية والمنطقية في قصص الجريمة والغموض."
         )
         # لم نعد بحاجة إلى الأداة الوهمية، سنعتمد على prompt ذكي
+        self._response_cache = ResponseCache(max_entries=10000, ttl=24 * 3600)
         logger.info("✅ Functional Forensic Logic Agent (V2) Initialized.")
 
     async def analyze_crime_scene(self, context: Dict[str, Any]) -> Dict[str, Any]:
@@ -32,11 +53,18 @@ class ForensicLogicAgent(BaseAgent):
         
         logger.info(f"Analyzing crime scene from text content...")
         
-        prompt = self._build_analysis_prompt(text_content)
-        analysis_result = await llm_service.generate_json_response(prompt, temperature=0.2)
+        cache_key = content_digest(text_content)
+        analysis_result = self._response_cache.get(cache_key)
+        if analysis_result is None:
+            prompt = self._build_analysis_prompt(text_content)
+            analysis_result = await llm_singleflight.do(
+                request_key(prompt, 0.2),
+                lambda: llm_service.generate_json_response(prompt, temperature=0.2)
+            )
 
-        if "error" in analysis_result:
-            return {"status": "error", "message": "LLM call for forensic analysis failed.", "details": analysis_result}
+            if "error" in analysis_result:
+                return {"status": "error", "message": "LLM call for forensic analysis failed.", "details": analysis_result}
+            self._response_cache.set(cache_key, analysis_result)
         
         return {
             "status": "success",
@@ -45,24 +73,7 @@ class ForensicLogicAgent(BaseAgent):
         }
 
     def _build_analysis_prompt(self, scene_text: str) -> str:
-        return f"""
-مهمتك: أنت محقق جنائي خبير ومستشار للروائيين. مهمتك هي قراءة النص الذي يصف مشهد جريمة، ثم تقديم تحليل دقيق للمنطق الجنائي والإجرائي.
-
-**نص مشهد الجريمة:**
----
-{scene_text}
----
-
-**التعليمات:**
-قم بتحليل النص أعلاه وأرجع تقريرك **حصريًا** بتنسيق JSON، يغطي النقاط التالية:
-1.  **crime_type:** حدد نوع الجريمة الموصوفة (مثال: "جريمة قتل بآلة حادة"، "سرقة مع اقتحام").
-2.  **evidence_analysis:** حلل الأدلة المذكورة. لكل دليل، اذكر نوعه (مادي، بيولوجي، رقمي) وقيمته المحتملة في التحقيق.
-3.  **procedural_errors:** اذكر أي أخطاء إجرائية واضحة قام بها المحققون في مسرح الجريمة (مثال: "لم يتم تأمين مسرح الجريمة"، "تم لمس الدليل بدون قفازات").
-4.  **logical_inconsistencies:** اذكر أي تناقضات منطقية في المشهد (مثال: "الضحية مصابة بطلق ناري ولكن لا يوجد ذكر لصوت إطلاق نار").
-5.  **recommendations:** قدم توصيتين لتحسين واقعية المشهد الجنائي.
-
-**تقرير التحليل الجنائي (JSON):**
-"""
+        return _ANALYSIS_PROMPT_TEMPLATE.format(scene_text=scene_text)
 
     async def process_task(self, context: Dict[str, Any], **kwargs) -> Dict[str, Any]:
         return await self.analyze_crime_scene(context)
@@ -1,16 +1,21 @@
 # agents/frailty_injector_agent.py
 import logging
+import random
 from typing import Dict, Any, Optional
 from .base_agent import BaseAgent
 
 logger = logging.getLogger("FrailtyInjectorAgent")
 
 class AuthenticFrailtyInjectorAgent(BaseAgent):
+    _FRAILTY_PHRASES = ("... صمت للحظة.", "... وبدا التردد في صوته.", "... لم يجد الكلمات المناسبة.")
+
     def __init__(self, agent_id: Optional[str] = None):
         super().__init__(
             agent_id=agent_id, name="المُنكسِر (حاقن الضعف)",
             description="يضيف لمسة من الصدق الإنساني عن طريق محاكاة النقص والتردد."
         )
+        # مولد عشوائي خاص بالوكيل بدل الحالة المشتركة لوحدة random
+        self._rng = random.Random()
 
     async def humanize_text(self, context: Dict[str, Any], feedback: Optional[Any] = None) -> Dict[str, Any]:
         text = context.get("text_content")
@@ -18,13 +23,10 @@ class AuthenticFrailtyInjectorAgent(BaseAgent):
         
         logger.info("Humanizing text by injecting authentic frailty...")
         
-        # محاكاة بسيطة: إضافة وقفة أو جملة بسيطة
-        sentences = text.split('.')
-        if len(sentences) > 1:
-            insertion_point = len(sentences) // 2
-            frailty_phrases = ["... صمت للحظة.", "... وبدا التردد في صوته.", "... لم يجد الكلمات المناسبة."]
-            sentences.insert(insertion_point, random.choice(frailty_phrases))
-            modified_text = ". ".join(s.strip() for s in sentences if s) + "."
+        # محاكاة بسيطة: إضافة وقفة أو جملة بسيطة بعد الجملة الوسطى
+        cut = self._middle_sentence_end(text)
+        if cut is not None:
+            modified_text = text[:cut] + " " + self._rng.choice(self._FRAILTY_PHRASES) + text[cut:]
         else:
             modified_text = text
 
@@ -32,3 +34,17 @@ class AuthenticFrailtyInjectorAgent(BaseAgent):
             "content": {"original_text": text, "humanized_text": modified_text},
             "summary": "تمت إضافة لمسة من الواقعية الإنسانية."
         }
+
+    @staticmethod
+    def _middle_sentence_end(text: str) -> Optional[int]:
+        """
+        يعيد الموضع الذي يلي النقطة الوسطى في النص (أو None إذا لم توجد نقاط)،
+        دون تقسيم النص بالكامل إلى جمل.
+        """
+        dot_count = text.count('.')
+        if dot_count == 0:
+            return None
+        position = -1
+        for _ in range((dot_count + 1) // 2):
+            position = text.find('.', position + 1)
+        return position + 1
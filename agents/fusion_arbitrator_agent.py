@@ -11,24 +11,102 @@
 """
 
 import asyncio
+import copy
+import hashlib
 import json
 import logging
-from typing import Dict, List, Tuple, Optional, Any
-from dataclasses import dataclass, asdict
+from typing import Dict, FrozenSet, List, Tuple, Optional, Any
+from dataclasses import dataclass, asdict, replace
 from datetime import datetime
 import re
-import statistics
 from collections import Counter, defaultdict
+from functools import lru_cache
+from itertools import chain
+from bisect import bisect_right
+from math import fsum
+from operator import mul
 
 from .base_agent import BaseAgent
+from ..core.llm_cache import ResponseCache
+from ..core.arabic_text import KeywordScanner
 
 # إعداد نظام السجلات
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@dataclass
-class QualityMetrics:
+# الأنماط الثابتة تُترجم مرة واحدة عند تحميل الوحدة
+_SENT_SPLIT = re.compile(r'[.!?]+')
+_NAME_SPEAKER = re.compile(r'\b[A-Za-zأ-ي]{3,}\b(?=\s+(?:قال|قالت|ذهب|ذهبت))')
+_NAME_SPEAKER_SHORT = re.compile(r'\b[A-Za-zأ-ي]{3,}\b(?=\s+(?:قال|قالت))')
+
+# مجموعات الكلمات المفتاحية لكل الفحوص (قد تظهر الكلمة في أكثر من مجموعة)،
+# ثابتة وتُبنى مرة واحدة عند تحميل الوحدة بدل قوائم جديدة في كل استدعاء
+_KEYWORD_GROUPS = {
+    'transition': frozenset({'ثم', 'بعد ذلك', 'فجأة', 'في النهاية', 'أخيراً'}),
+    'plot': frozenset({'بداية', 'مشكلة', 'صراع', 'حل', 'نهاية'}),
+    'temporal': frozenset({'صباح', 'مساء', 'ليل', 'نهار', 'أمس', 'اليوم', 'غداً'}),
+    'causal': frozenset({'لأن', 'بسبب', 'نتيجة', 'لذلك', 'من أجل', 'كي'}),
+    'tone_formal': frozenset({'إن', 'حيث', 'إذ', 'بل', 'لكن'}),
+    'tone_informal': frozenset({'يعني', 'طبعاً', 'أكيد', 'ممكن'}),
+    'conflict': frozenset({'صراع', 'مشكلة', 'تحدي', 'عقبة', 'صعوبة'}),
+    'ending': frozenset({'النهاية', 'أخيراً', 'انتهت', 'انتهى'}),
+    'cultural': frozenset({'تراث', 'أصالة', 'كرم', 'ضيافة', 'شهامة'}),
+    'emotional': frozenset({'حب', 'حزن', 'فرح', 'خوف', 'أمل', 'يأس', 'سعادة'}),
+}
+
+_KEYWORD_SCANNER = KeywordScanner(_KEYWORD_GROUPS, positional_groups=('transition',))
+
+@lru_cache(maxsize=128)
+def _names_scanner(names: FrozenSet[str]) -> KeywordScanner:
+    """ماسح أسماء الشخصيات، يُترجم نمطه مرة واحدة لكل مجموعة أسماء (إعادة تحكيم نفس القصة أو مسوداتها)"""
+    return KeywordScanner({'names': names})
+
+def _arbitration_fingerprint(narrative: str, sources: List[str], metadata: Dict[str, Any]) -> bytes:
+    """
+    بصمة مدخلات التحكيم: نفس النص والمصادر والبيانات الوصفية تعطي نفس البصمة.
+    النصوص تُمرر إلى الـ hasher مباشرة (مسبوقة بأطوالها حتى لا تلتبس الحدود بينها)
+    بدل تسلسلها أولاً في سلسلة JSON واحدة كبيرة؛ البيانات الوصفية الصغيرة وحدها تُسلسل.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    metadata_json = json.dumps(metadata, sort_keys=True, ensure_ascii=False, default=str)
+    for part in (narrative, metadata_json, *sources):
+        data = part.encode("utf-8")
+        hasher.update(len(data).to_bytes(8, "little"))
+        hasher.update(data)
+    return hasher.digest()
+
+# دوال حسابية صغيرة تعمل على الأعداد المحسوبة مسبقًا في NarrativeView
+def _density_score(count: int, units: int, scale: float) -> float:
+    """كثافة ظهور عنصر لكل وحدة (جملة أو كلمة) مضروبة في معامل، بحد أقصى 1"""
+    return min(count / units * scale, 1.0)
+
+def _readability_score(word_count: int, sentence_count: int) -> float:
+    """كلما قل متوسط طول الجملة، زادت سهولة القراءة"""
+    avg_sentence_length = word_count / sentence_count if sentence_count else 0
+    return max(0, 1 - (avg_sentence_length - 15) / 25) if avg_sentence_length > 15 else 1.0
+
+def _batch_readability(word_counts: List[int], sentence_counts: List[int]) -> List[float]:
+    """سهولة القراءة لدفعة من النصوص دفعة واحدة، من أعداد كلماتها وجملها"""
+    return list(map(_readability_score, word_counts, sentence_counts))
+
+class _FrozenRecord:
+    """
+    أساس للسجلات الثابتة ذات __slots__: السجلات تُنشأ بكثرة (سجل لكل مشكلة مكتشفة)،
+    و __slots__ يلغي قاموس الخصائص لكل نسخة، و frozen يمنع تعديلها بعد الإنشاء
+    (يُستخدم dataclasses.replace لإنتاج نسخة معدلة).
+    """
+    __slots__ = ()
+
+    def __reduce__(self):
+        # النسخ (copy/deepcopy) والتسلسل (pickle) يعيدان بناء السجل عبر __init__
+        # بدل إسناد الحقول، وهو ما يمنعه frozen
+        return (self.__class__, tuple(getattr(self, name) for name in self.__slots__))
+
+@dataclass(frozen=True)
+class QualityMetrics(_FrozenRecord):
     """مقاييس الجودة الشاملة"""
+    __slots__ = ('coherence_score', 'consistency_score', 'authenticity_score', 'creativity_score', 'technical_score', 'cultural_sensitivity', 'readability_score', 'emotional_resonance', 'overall_quality')
+
     coherence_score: float  # التماسك السردي
     consistency_score: float  # الاتساق الداخلي
     authenticity_score: float  # الأصالة الأدبية
@@ -39,9 +117,11 @@ class QualityMetrics:
     emotional_resonance: float  # الرنين العاطفي
     overall_quality: float  # الجودة الإجمالية
 
-@dataclass
-class IssueReport:
+@dataclass(frozen=True)
+class IssueReport(_FrozenRecord):
     """تقرير المشاكل المكتشفة"""
+    __slots__ = ('issue_id', 'severity', 'category', 'description', 'location', 'suggested_fix', 'impact_assessment', 'priority')
+
     issue_id: str
     severity: str  # 'critical', 'major', 'minor', 'suggestion'
     category: str  # 'plot', 'character', 'style', 'language', 'structure'
@@ -51,9 +131,11 @@ class IssueReport:
     impact_assessment: str
     priority: int  # 1-10
 
-@dataclass
-class ArbitrationResult:
+@dataclass(frozen=True)
+class ArbitrationResult(_FrozenRecord):
     """نتيجة التحكيم الشاملة"""
+    __slots__ = ('arbitration_id', 'quality_metrics', 'detected_issues', 'recommendations', 'improvement_suggestions', 'approval_status', 'confidence_level', 'processing_timestamp')
+
     arbitration_id: str
     quality_metrics: QualityMetrics
     detected_issues: List[IssueReport]
@@ -63,9 +145,105 @@ class ArbitrationResult:
     confidence_level: float
     processing_timestamp: str
 
+@dataclass
+class NarrativeView:
+    """تجزئة النص مرة واحدة (جمل، كلمات، كلمات مفتاحية) ومشاركتها بين جميع الفحوص"""
+    text: str
+    sentences: List[str]
+    sentence_breaks: List[int]  # موضع بداية كل فاصل جمل في النص
+    sentence_word_counts: List[int]  # عدد كلمات كل جملة غير فارغة
+    counter: Counter
+    word_count: int
+    keyword_hits: Counter  # عدد تطابقات كل كلمة مفتاحية
+    group_hits: Counter  # عدد تطابقات كل مجموعة في _KEYWORD_GROUPS
+    group_positions: Dict[str, List[int]]  # مواضع التطابق للمجموعات الموضعية
+
+    @classmethod
+    def build(cls, text: str) -> "NarrativeView":
+        words = text.split()
+        # مرور واحد يعطي الجمل (مثل _SENT_SPLIT.split) ومواضع الفواصل بينها معًا
+        sentences, sentence_breaks, start = [], [], 0
+        for match in _SENT_SPLIT.finditer(text):
+            sentences.append(text[start:match.start()])
+            sentence_breaks.append(match.start())
+            start = match.end()
+        sentences.append(text[start:])
+        # الكلمات المفتاحية كلها عربية (لا تتأثر بحالة الأحرف)، فيكفي مسح النص الأصلي
+        keyword_hits, group_hits, group_positions = _KEYWORD_SCANNER.scan(text)
+        return cls(
+            text=text,
+            sentences=sentences,
+            sentence_breaks=sentence_breaks,
+            # الجملة غير الفارغة هي التي يعطي تقسيمها كلمة واحدة على الأقل
+            sentence_word_counts=[n for n in map(len, map(str.split, sentences)) if n],
+            # Counter يعدّ في حلقة C واحدة، ولا تُحتفظ بقائمة الكلمات نفسها بعد العد
+            counter=Counter(words),
+            word_count=len(words),
+            keyword_hits=keyword_hits,
+            group_hits=group_hits,
+            group_positions=group_positions
+        )
+
 class FusionArbitratorAgent(BaseAgent):
     """وكيل محكم الاندماج السردي المتقدم"""
     
+    # قوالب المشاكل الثابتة بترتيب حقول IssueReport:
+    # (issue_id, severity, category, description, location, suggested_fix, impact_assessment, priority)
+    _PLOT_NO_CONFLICT = (
+        "plot_001", "major", "plot",
+        "لا يوجد صراع واضح في القصة", "النص بأكمله",
+        "إضافة عنصر صراع واضح يحرك الأحداث", "يؤثر على جاذبية القصة", 8
+    )
+    _PLOT_NO_ENDING = (
+        "plot_002", "minor", "plot",
+        "النهاية غير واضحة", "نهاية النص",
+        "إضافة خاتمة واضحة للقصة", "قد يترك القارئ محتاراً", 5
+    )
+    _CHAR_NONE = (
+        "char_001", "critical", "character",
+        "لا توجد شخصيات واضحة في القصة", "النص بأكمله",
+        "إضافة شخصيات محددة بأسماء وحوارات", "القصة تحتاج شخصيات للتفاعل", 9
+    )
+    _STYLE_LONG_SENTENCES = (
+        "style_001", "minor", "style",
+        "الجمل طويلة جداً", "النص بأكمله",
+        "تقسيم الجمل الطويلة إلى جمل أقصر", "قد يؤثر على سهولة القراءة", 4
+    )
+    _TRIVIAL_INPUT = (
+        "struct_000", "major", "structure",
+        "النص فارغ أو أقصر من أن يُقيَّم", "النص بأكمله",
+        "توليد نص سردي كامل قبل التحكيم", "لا يمكن الحكم على جودة النص", 10
+    )
+    _STRUCT_FEW_PARAGRAPHS = (
+        "struct_001", "minor", "structure",
+        "النص يحتاج لتقسيم أفضل إلى فقرات", "النص بأكمله",
+        "تقسيم النص إلى فقرات منطقية", "يحسن من تنظيم النص", 4
+    )
+    
+    # درجات محاكاة للفحوص التي لم تُنفذ بعد. في التطبيق الفعلي ستستخدم أدوات متخصصة
+    # (مثل التحليل النحوي)، وعندها تُستبدل القيمة هنا باستدعاء الفحص الحقيقي.
+    _STUB_SCORES = {
+        'style_consistency': 0.8,
+        'information_consistency': 0.85,
+        'perspective_consistency': 0.8,
+        'language_authenticity': 0.85,
+        'dialogue_authenticity': 0.8,
+        'description_authenticity': 0.85,
+        'cultural_context_authenticity': 0.9,
+        'plot_innovation': 0.75,
+        'character_innovation': 0.8,
+        'style_innovation': 0.7,
+        'treatment_innovation': 0.75,
+        'grammar_quality': 0.85,
+    }
+    
+    # ترتيب المقاييس في الجودة الإجمالية
+    _WEIGHT_KEYS = ('coherence', 'consistency', 'authenticity', 'creativity',
+                    'technical', 'cultural', 'readability', 'emotional')
+    
+    # النصوص الأقصر من هذا (بالأحرف) لا تُحلل، فكل مقاييسها بلا معنى
+    _MIN_NARRATIVE_LENGTH = 50
+    
     def __init__(self, agent_id: str = "fusion_arbitrator", **kwargs):
         super().__init__(agent_id, **kwargs)
         self.agent_type = "fusion_arbitrator"
@@ -100,6 +278,9 @@ class FusionArbitratorAgent(BaseAgent):
             'emotional': 0.05
         }
         
+        # الأوزان كمتجه ثابت بترتيب المقاييس، بدل ثماني عمليات بحث بالمفتاح في كل تقييم
+        self._weight_vector = tuple(self.evaluation_weights[key] for key in self._WEIGHT_KEYS)
+        
         # قوائم المراجعة
         self.coherence_checklist = [
             'logical_flow',
@@ -116,6 +297,12 @@ class FusionArbitratorAgent(BaseAgent):
             'narrative_perspective',
             'linguistic_harmony'
         ]
+        
+        # نتائج التحكيم الأخيرة: إعادة المحاولة أو المقارنة على نفس المدخلات لا تعيد التحليل كله
+        self._result_cache = ResponseCache(max_entries=128, ttl=None)
+        
+        # نتيجة جاهزة للمدخلات الفارغة أو القصيرة جدًا
+        self._trivial_result = self._build_trivial_result()
 
     async def arbitrate_fusion(self, synthesized_narrative: str, 
                              source_narratives: List[str],
@@ -136,35 +323,54 @@ class FusionArbitratorAgent(BaseAgent):
             
             arbitration_id = f"arbitration_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
             
-            # 1. تحليل الجودة الشاملة
-            logger.info("تحليل الجودة الشاملة...")
-            quality_metrics = await self._assess_comprehensive_quality(
-                synthesized_narrative, source_narratives, fusion_metadata
-            )
+            if len(synthesized_narrative.strip()) < self._MIN_NARRATIVE_LENGTH:
+                return self._trivial_rejection(arbitration_id)
+            
+            cache_key = _arbitration_fingerprint(synthesized_narrative, source_narratives, fusion_metadata)
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"نتيجة تحكيم محفوظة لنفس المدخلات - الحالة: {cached.approval_status}")
+                # ResponseCache يعيد نسخة عميقة، فيكفي تحديث المعرف والتوقيت
+                return replace(cached, arbitration_id=arbitration_id,
+                               processing_timestamp=datetime.now().isoformat())
             
-            # 2. كشف المشاكل والتناقضات
-            logger.info("كشف المشاكل والتناقضات...")
-            detected_issues = await self._detect_issues(
-                synthesized_narrative, source_narratives, fusion_metadata
+            # تجزئة النص مرة واحدة لكل عملية تحكيم
+            view = NarrativeView.build(synthesized_narrative)
+            if not view.sentence_word_counts:  # علامات ترقيم فقط، بلا كلمات
+                return self._trivial_rejection(arbitration_id)
+            
+            # 1. تحليل الجودة الشاملة و 2. كشف المشاكل والتناقضات
+            # الفحوص حسابية بحتة، فتُنفذ في مجمع الخيوط حتى لا تُعطِّل حلقة الأحداث
+            logger.info("تحليل الجودة الشاملة وكشف المشاكل والتناقضات...")
+            loop = asyncio.get_running_loop()
+            quality_metrics, detected_issues = await asyncio.gather(
+                loop.run_in_executor(
+                    None, self._assess_comprehensive_quality, view, source_narratives, fusion_metadata
+                ),
+                loop.run_in_executor(
+                    None, self._detect_issues, view, source_narratives, fusion_metadata
+                )
             )
             
             # 3. توليد التوصيات
             logger.info("توليد التوصيات...")
-            recommendations = await self._generate_recommendations(
-                quality_metrics, detected_issues, fusion_metadata
+            # تصنيف المشاكل حسب الخطورة مرة واحدة لكل الخطوات التالية
+            severity_counts = self._count_severities(detected_issues)
+            recommendations = self._generate_recommendations(
+                quality_metrics, severity_counts, fusion_metadata
             )
             
             # 4. اقتراحات التحسين
             logger.info("تطوير اقتراحات التحسين...")
-            improvement_suggestions = await self._develop_improvement_suggestions(
+            improvement_suggestions = self._develop_improvement_suggestions(
                 synthesized_narrative, detected_issues, quality_metrics
             )
             
             # 5. تحديد حالة الموافقة
-            approval_status = await self._determine_approval_status(quality_metrics, detected_issues)
+            approval_status = self._determine_approval_status(quality_metrics, severity_counts)
             
             # 6. حساب مستوى الثقة
-            confidence_level = await self._calculate_confidence_level(quality_metrics, detected_issues)
+            confidence_level = self._calculate_confidence_level(quality_metrics, detected_issues)
             
             result = ArbitrationResult(
                 arbitration_id=arbitration_id,
@@ -177,6 +383,7 @@ class FusionArbitratorAgent(BaseAgent):
                 processing_timestamp=datetime.now().isoformat()
             )
             
+            self._result_cache.set(cache_key, result)
             logger.info(f"تم إكمال التحكيم - الحالة: {approval_status}")
             return result
             
@@ -184,196 +391,130 @@ class FusionArbitratorAgent(BaseAgent):
             logger.error(f"خطأ في عملية التحكيم: {str(e)}")
             raise
 
-    async def _assess_comprehensive_quality(self, narrative: str, sources: List[str],
-                                          metadata: Dict[str, Any]) -> QualityMetrics:
+    def batch_readability(self, narratives: List[str]) -> List[float]:
+        """
+        تقييم سهولة القراءة لمجموعة نصوص (لاختبارات الانحدار ومسوحات الجودة دون اتصال).
+        لا يبني NarrativeView كاملاً: يكفي عدد الكلمات وعدد الجمل لكل نص.
+        """
+        word_counts = [len(text.split()) for text in narratives]
+        # عدد الجمل = عدد الفواصل + 1، تمامًا كطول نتيجة _SENT_SPLIT.split
+        sentence_counts = [len(_SENT_SPLIT.findall(text)) + 1 for text in narratives]
+        return _batch_readability(word_counts, sentence_counts)
+
+    @staticmethod
+    def _fresh_copy(template: ArbitrationResult, arbitration_id: str) -> ArbitrationResult:
+        """نسخة عميقة من نتيجة جاهزة بمعرف وتوقيت جديدين (القوائم والقواميس غير مشتركة)"""
+        return replace(copy.deepcopy(template), arbitration_id=arbitration_id,
+                       processing_timestamp=datetime.now().isoformat())
+
+    def _build_trivial_result(self) -> ArbitrationResult:
+        """يبني مرة واحدة نتيجة "needs_revision" للمدخلات التي لا تستحق التحليل الكامل"""
+        quality_metrics = QualityMetrics(*(0.0,) * 9)
+        issues = [IssueReport(*self._TRIVIAL_INPUT)]
+        severity_counts = self._count_severities(issues)
+        return ArbitrationResult(
+            arbitration_id="",
+            quality_metrics=quality_metrics,
+            detected_issues=issues,
+            recommendations=self._generate_recommendations(quality_metrics, severity_counts, {}),
+            improvement_suggestions=self._develop_improvement_suggestions("", issues, quality_metrics),
+            approval_status=self._determine_approval_status(quality_metrics, severity_counts),
+            confidence_level=self._calculate_confidence_level(quality_metrics, issues),
+            processing_timestamp=""
+        )
+
+    def _trivial_rejection(self, arbitration_id: str) -> ArbitrationResult:
+        logger.info("النص فارغ أو قصير جداً - تخطي التحليل الكامل")
+        return self._fresh_copy(self._trivial_result, arbitration_id)
+
+    def _assess_comprehensive_quality(self, view: NarrativeView, sources: List[str],
+                                    metadata: Dict[str, Any]) -> QualityMetrics:
         """تقييم الجودة الشاملة للنص المُخلق"""
         
-        # 1. تقييم التماسك السردي
-        coherence_score = await self._evaluate_coherence(narrative)
-        
-        # 2. تقييم الاتساق الداخلي
-        consistency_score = await self._evaluate_consistency(narrative, sources)
-        
-        # 3. تقييم الأصالة الأدبية
-        authenticity_score = await self._evaluate_authenticity(narrative)
-        
-        # 4. تقييم الإبداعية
-        creativity_score = await self._evaluate_creativity(narrative, sources)
-        
-        # 5. تقييم الجودة التقنية
-        technical_score = await self._evaluate_technical_quality(narrative)
-        
-        # 6. تقييم الحساسية الثقافية
-        cultural_sensitivity = await self._evaluate_cultural_sensitivity(narrative)
-        
-        # 7. تقييم سهولة القراءة
-        readability_score = await self._evaluate_readability(narrative)
-        
-        # 8. تقييم الرنين العاطفي
-        emotional_resonance = await self._evaluate_emotional_resonance(narrative)
-        
-        # حساب الجودة الإجمالية
-        overall_quality = (
-            coherence_score * self.evaluation_weights['coherence'] +
-            consistency_score * self.evaluation_weights['consistency'] +
-            authenticity_score * self.evaluation_weights['authenticity'] +
-            creativity_score * self.evaluation_weights['creativity'] +
-            technical_score * self.evaluation_weights['technical'] +
-            cultural_sensitivity * self.evaluation_weights['cultural'] +
-            readability_score * self.evaluation_weights['readability'] +
-            emotional_resonance * self.evaluation_weights['emotional']
+        # الترتيب هنا هو نفسه ترتيب _WEIGHT_KEYS وترتيب حقول QualityMetrics
+        scores = (
+            self._evaluate_coherence(view),  # 1. التماسك السردي
+            self._evaluate_consistency(view, sources),  # 2. الاتساق الداخلي
+            self._evaluate_authenticity(view.text),  # 3. الأصالة الأدبية
+            self._evaluate_creativity(view.text, sources),  # 4. الإبداعية
+            self._evaluate_technical_quality(view),  # 5. الجودة التقنية
+            self._evaluate_cultural_sensitivity(view),  # 6. الحساسية الثقافية
+            self._evaluate_readability(view),  # 7. سهولة القراءة
+            self._evaluate_emotional_resonance(view)  # 8. الرنين العاطفي
         )
         
-        return QualityMetrics(
-            coherence_score=coherence_score,
-            consistency_score=consistency_score,
-            authenticity_score=authenticity_score,
-            creativity_score=creativity_score,
-            technical_score=technical_score,
-            cultural_sensitivity=cultural_sensitivity,
-            readability_score=readability_score,
-            emotional_resonance=emotional_resonance,
-            overall_quality=overall_quality
-        )
+        # حساب الجودة الإجمالية (مجموع موزون بنفس ترتيب الجمع السابق)
+        overall_quality = sum(map(mul, scores, self._weight_vector))
+        
+        return QualityMetrics(*scores, overall_quality)
 
-    async def _evaluate_coherence(self, narrative: str) -> float:
+    def _evaluate_coherence(self, view: NarrativeView) -> float:
         """تقييم التماسك السردي"""
-        scores = []
-        
-        # فحص التدفق المنطقي
-        logical_flow = await self._check_logical_flow(narrative)
-        scores.append(logical_flow)
-        
-        # فحص ثبات الحبكة
-        plot_consistency = await self._check_plot_consistency(narrative)
-        scores.append(plot_consistency)
-        
-        # فحص استمرارية الشخصيات
-        character_continuity = await self._check_character_continuity(narrative)
-        scores.append(character_continuity)
-        
-        # فحص التماسك الزمني
-        temporal_coherence = await self._check_temporal_coherence(narrative)
-        scores.append(temporal_coherence)
-        
-        # فحص العلاقات السببية
-        causal_relationships = await self._check_causal_relationships(narrative)
-        scores.append(causal_relationships)
+        scores = (
+            self._check_logical_flow(view),  # التدفق المنطقي
+            self._check_plot_consistency(view),  # ثبات الحبكة
+            self._check_character_continuity(view),  # استمرارية الشخصيات
+            self._check_temporal_coherence(view),  # التماسك الزمني
+            self._check_causal_relationships(view)  # العلاقات السببية
+        )
         
-        return statistics.mean(scores)
+        return fsum(scores) / len(scores)
 
-    async def _evaluate_consistency(self, narrative: str, sources: List[str]) -> float:
+    def _evaluate_consistency(self, view: NarrativeView, sources: List[str]) -> float:
         """تقييم الاتساق الداخلي"""
-        scores = []
-        
-        # اتساق النبرة
-        tone_consistency = await self._check_tone_consistency(narrative)
-        scores.append(tone_consistency)
-        
-        # اتساق الأسلوب
-        style_consistency = await self._check_style_consistency(narrative)
-        scores.append(style_consistency)
-        
-        # اتساق المعلومات
-        information_consistency = await self._check_information_consistency(narrative)
-        scores.append(information_consistency)
-        
-        # اتساق وجهة النظر السردية
-        perspective_consistency = await self._check_perspective_consistency(narrative)
-        scores.append(perspective_consistency)
+        scores = (
+            self._check_tone_consistency(view),  # اتساق النبرة
+            self._STUB_SCORES['style_consistency'],  # اتساق الأسلوب
+            self._STUB_SCORES['information_consistency'],  # اتساق المعلومات
+            self._STUB_SCORES['perspective_consistency']  # اتساق وجهة النظر السردية
+        )
         
-        return statistics.mean(scores)
+        return fsum(scores) / len(scores)
 
-    async def _evaluate_authenticity(self, narrative: str) -> float:
+    def _evaluate_authenticity(self, narrative: str) -> float:
         """تقييم الأصالة الأدبية"""
-        scores = []
-        
-        # أصالة اللغة
-        language_authenticity = await self._check_language_authenticity(narrative)
-        scores.append(language_authenticity)
-        
-        # أصالة الحوارات
-        dialogue_authenticity = await self._check_dialogue_authenticity(narrative)
-        scores.append(dialogue_authenticity)
-        
-        # أصالة الوصف
-        description_authenticity = await self._check_description_authenticity(narrative)
-        scores.append(description_authenticity)
-        
-        # أصالة السياق الثقافي
-        cultural_authenticity = await self._check_cultural_context_authenticity(narrative)
-        scores.append(cultural_authenticity)
+        scores = (
+            self._STUB_SCORES['language_authenticity'],  # أصالة اللغة
+            self._STUB_SCORES['dialogue_authenticity'],  # أصالة الحوارات
+            self._STUB_SCORES['description_authenticity'],  # أصالة الوصف
+            self._STUB_SCORES['cultural_context_authenticity']  # أصالة السياق الثقافي
+        )
         
-        return statistics.mean(scores)
+        return fsum(scores) / len(scores)
 
-    async def _evaluate_creativity(self, narrative: str, sources: List[str]) -> float:
+    def _evaluate_creativity(self, narrative: str, sources: List[str]) -> float:
         """تقييم الإبداعية والابتكار"""
-        scores = []
-        
-        # الابتكار في الحبكة
-        plot_innovation = await self._assess_plot_innovation(narrative, sources)
-        scores.append(plot_innovation)
-        
-        # الابتكار في الشخصيات
-        character_innovation = await self._assess_character_innovation(narrative, sources)
-        scores.append(character_innovation)
-        
-        # الابتكار في الأسلوب
-        style_innovation = await self._assess_style_innovation(narrative, sources)
-        scores.append(style_innovation)
-        
-        # الابتكار في المعالجة
-        treatment_innovation = await self._assess_treatment_innovation(narrative, sources)
-        scores.append(treatment_innovation)
+        scores = (
+            self._STUB_SCORES['plot_innovation'],  # الابتكار في الحبكة
+            self._STUB_SCORES['character_innovation'],  # الابتكار في الشخصيات
+            self._STUB_SCORES['style_innovation'],  # الابتكار في الأسلوب
+            self._STUB_SCORES['treatment_innovation']  # الابتكار في المعالجة
+        )
         
-        return statistics.mean(scores)
+        return fsum(scores) / len(scores)
 
-    async def _evaluate_technical_quality(self, narrative: str) -> float:
+    def _evaluate_technical_quality(self, view: NarrativeView) -> float:
         """تقييم الجودة التقنية"""
-        scores = []
-        
-        # الجودة النحوية
-        grammar_quality = await self._assess_grammar_quality(narrative)
-        scores.append(grammar_quality)
-        
-        # جودة الترقيم
-        punctuation_quality = await self._assess_punctuation_quality(narrative)
-        scores.append(punctuation_quality)
-        
-        # جودة البنية
-        structure_quality = await self._assess_structure_quality(narrative)
-        scores.append(structure_quality)
-        
-        # جودة المفردات
-        vocabulary_quality = await self._assess_vocabulary_quality(narrative)
-        scores.append(vocabulary_quality)
+        scores = (
+            self._STUB_SCORES['grammar_quality'],  # الجودة النحوية
+            self._assess_punctuation_quality(view),  # جودة الترقيم
+            self._assess_structure_quality(view.text),  # جودة البنية
+            self._assess_vocabulary_quality(view)  # جودة المفردات
+        )
         
-        return statistics.mean(scores)
+        return fsum(scores) / len(scores)
 
-    async def _detect_issues(self, narrative: str, sources: List[str],
-                           metadata: Dict[str, Any]) -> List[IssueReport]:
+    def _detect_issues(self, view: NarrativeView, sources: List[str],
+                     metadata: Dict[str, Any]) -> List[IssueReport]:
         """كشف المشاكل والتناقضات في النص"""
-        issues = []
-        
-        # كشف مشاكل الحبكة
-        plot_issues = await self._detect_plot_issues(narrative)
-        issues.extend(plot_issues)
-        
-        # كشف مشاكل الشخصيات
-        character_issues = await self._detect_character_issues(narrative)
-        issues.extend(character_issues)
-        
-        # كشف مشاكل الأسلوب
-        style_issues = await self._detect_style_issues(narrative)
-        issues.extend(style_issues)
-        
-        # كشف مشاكل اللغة
-        language_issues = await self._detect_language_issues(narrative)
-        issues.extend(language_issues)
-        
-        # كشف مشاكل البنية
-        structure_issues = await self._detect_structure_issues(narrative)
-        issues.extend(structure_issues)
+        detector_results = (
+            self._detect_plot_issues(view),  # مشاكل الحبكة
+            self._detect_character_issues(view.text),  # مشاكل الشخصيات
+            self._detect_style_issues(view),  # مشاكل الأسلوب
+            self._detect_language_issues(view),  # مشاكل اللغة
+            self._detect_structure_issues(view.text)  # مشاكل البنية
+        )
+        issues = list(chain.from_iterable(detector_results))
         
         # ترتيب المشاكل حسب الأولوية
         issues.sort(key=lambda x: x.priority, reverse=True)
@@ -381,71 +522,58 @@ class FusionArbitratorAgent(BaseAgent):
         return issues
 
     # وظائف مساعدة للفحص التفصيلي
-    async def _check_logical_flow(self, narrative: str) -> float:
+    def _check_logical_flow(self, view: NarrativeView) -> float:
         """فحص التدفق المنطقي للأحداث"""
-        sentences = re.split(r'[.!?]+', narrative)
-        transitions = ['ثم', 'بعد ذلك', 'فجأة', 'في النهاية', 'أخيراً']
-        
-        transition_count = sum(any(trans in sentence for trans in transitions) 
-                             for sentence in sentences)
+        # يُنسب كل رابط إلى جملته من خلال مواضع الفواصل
+        # (الروابط لا تحتوي علامات ترقيم، فلا يعبر أي تطابق حدود جملتين)
+        transition_sentences = {bisect_right(view.sentence_breaks, position)
+                                for position in view.group_positions['transition']}
         
         # نسبة وجود الروابط المنطقية
-        return min(transition_count / len(sentences) * 5, 1.0)
+        return _density_score(len(transition_sentences), len(view.sentences), 5)
 
-    async def _check_plot_consistency(self, narrative: str) -> float:
+    def _check_plot_consistency(self, view: NarrativeView) -> float:
         """فحص ثبات الحبكة"""
         # فحص بسيط لوجود عناصر الحبكة الأساسية
-        plot_elements = ['بداية', 'مشكلة', 'صراع', 'حل', 'نهاية']
-        found_elements = sum(1 for element in plot_elements 
-                           if any(keyword in narrative.lower() 
-                                for keyword in [element]))
+        plot_elements = _KEYWORD_GROUPS['plot']
+        found_elements = sum(1 for element in plot_elements if view.keyword_hits[element])
         
         return found_elements / len(plot_elements)
 
-    async def _check_character_continuity(self, narrative: str) -> float:
+    def _check_character_continuity(self, view: NarrativeView) -> float:
         """فحص استمرارية الشخصيات"""
         # استخلاص الأسماء المحتملة
-        names = re.findall(r'\b[A-Za-zأ-ي]{3,}\b(?=\s+(?:قال|قالت|ذهب|ذهبت))', narrative)
-        unique_names = set(names)
+        names = _NAME_SPEAKER.findall(view.text)
+        unique_names = frozenset(names)
         
         if not unique_names:
             return 0.5
         
-        # فحص استمرارية ظهور الشخصيات
+        # فحص استمرارية ظهور الشخصيات: عدّ ظهور كل الأسماء في مسح واحد للنص
+        # بدل مسح كامل لكل اسم
+        mentions_by_name, _, _ = _names_scanner(unique_names).scan(view.text)
         continuity_scores = []
         for name in unique_names:
-            mentions = narrative.count(name)
+            mentions = mentions_by_name[name]
             if mentions > 1:
                 continuity_scores.append(min(mentions / 10, 1.0))
         
-        return statistics.mean(continuity_scores) if continuity_scores else 0.5
+        return fsum(continuity_scores) / len(continuity_scores) if continuity_scores else 0.5
 
-    async def _check_temporal_coherence(self, narrative: str) -> float:
+    def _check_temporal_coherence(self, view: NarrativeView) -> float:
         """فحص التماسك الزمني"""
-        time_indicators = ['صباح', 'مساء', 'ليل', 'نهار', 'أمس', 'اليوم', 'غداً']
-        
-        found_indicators = sum(narrative.lower().count(indicator) 
-                             for indicator in time_indicators)
-        
-        sentences = len(re.split(r'[.!?]+', narrative))
-        return min(found_indicators / sentences * 3, 1.0)
+        found_indicators = view.group_hits['temporal']
+        return _density_score(found_indicators, len(view.sentences), 3)
 
-    async def _check_causal_relationships(self, narrative: str) -> float:
+    def _check_causal_relationships(self, view: NarrativeView) -> float:
         """فحص العلاقات السببية"""
-        causal_connectors = ['لأن', 'بسبب', 'نتيجة', 'لذلك', 'من أجل', 'كي']
-        
-        causal_count = sum(narrative.count(connector) for connector in causal_connectors)
-        sentences = len(re.split(r'[.!?]+', narrative))
-        
-        return min(causal_count / sentences * 4, 1.0)
+        causal_count = view.group_hits['causal']
+        return _density_score(causal_count, len(view.sentences), 4)
 
-    async def _check_tone_consistency(self, narrative: str) -> float:
+    def _check_tone_consistency(self, view: NarrativeView) -> float:
         """فحص اتساق النبرة"""
-        formal_indicators = ['إن', 'حيث', 'إذ', 'بل', 'لكن']
-        informal_indicators = ['يعني', 'طبعاً', 'أكيد', 'ممكن']
-        
-        formal_count = sum(narrative.count(word) for word in formal_indicators)
-        informal_count = sum(narrative.count(word) for word in informal_indicators)
+        formal_count = view.group_hits['tone_formal']
+        informal_count = view.group_hits['tone_informal']
         
         total = formal_count + informal_count
         if total == 0:
@@ -455,111 +583,68 @@ class FusionArbitratorAgent(BaseAgent):
         dominant_ratio = max(formal_count, informal_count) / total
         return dominant_ratio
 
-    async def _detect_plot_issues(self, narrative: str) -> List[IssueReport]:
+    def _detect_plot_issues(self, view: NarrativeView) -> List[IssueReport]:
         """كشف مشاكل الحبكة"""
         issues = []
         
         # فحص وجود صراع واضح
-        conflict_indicators = ['صراع', 'مشكلة', 'تحدي', 'عقبة', 'صعوبة']
-        has_conflict = any(indicator in narrative.lower() for indicator in conflict_indicators)
+        has_conflict = view.group_hits['conflict'] > 0
         
         if not has_conflict:
-            issues.append(IssueReport(
-                issue_id="plot_001",
-                severity="major",
-                category="plot",
-                description="لا يوجد صراع واضح في القصة",
-                location="النص بأكمله",
-                suggested_fix="إضافة عنصر صراع واضح يحرك الأحداث",
-                impact_assessment="يؤثر على جاذبية القصة",
-                priority=8
-            ))
+            issues.append(IssueReport(*self._PLOT_NO_CONFLICT))
         
         # فحص وجود نهاية
-        ending_indicators = ['النهاية', 'أخيراً', 'انتهت', 'انتهى']
-        has_ending = any(indicator in narrative.lower() for indicator in ending_indicators)
+        has_ending = view.group_hits['ending'] > 0
         
         if not has_ending:
-            issues.append(IssueReport(
-                issue_id="plot_002",
-                severity="minor",
-                category="plot",
-                description="النهاية غير واضحة",
-                location="نهاية النص",
-                suggested_fix="إضافة خاتمة واضحة للقصة",
-                impact_assessment="قد يترك القارئ محتاراً",
-                priority=5
-            ))
+            issues.append(IssueReport(*self._PLOT_NO_ENDING))
         
         return issues
 
-    async def _detect_character_issues(self, narrative: str) -> List[IssueReport]:
+    def _detect_character_issues(self, narrative: str) -> List[IssueReport]:
         """كشف مشاكل الشخصيات"""
         issues = []
         
         # فحص وجود شخصيات
-        character_indicators = re.findall(r'\b[A-Za-zأ-ي]{3,}\b(?=\s+(?:قال|قالت))', narrative)
-        
-        if len(character_indicators) < 1:
-            issues.append(IssueReport(
-                issue_id="char_001",
-                severity="critical",
-                category="character",
-                description="لا توجد شخصيات واضحة في القصة",
-                location="النص بأكمله",
-                suggested_fix="إضافة شخصيات محددة بأسماء وحوارات",
-                impact_assessment="القصة تحتاج شخصيات للتفاعل",
-                priority=9
-            ))
+        # يكفي أول متحدث مسمى، فلا داعي لجمع كل التطابقات
+        has_character = _NAME_SPEAKER_SHORT.search(narrative) is not None
+        
+        if not has_character:
+            issues.append(IssueReport(*self._CHAR_NONE))
         
         return issues
 
-    async def _detect_style_issues(self, narrative: str) -> List[IssueReport]:
+    def _detect_style_issues(self, view: NarrativeView) -> List[IssueReport]:
         """كشف مشاكل الأسلوب"""
         issues = []
         
         # فحص طول الجمل
-        sentences = re.split(r'[.!?]+', narrative)
-        avg_length = statistics.mean(len(sentence.split()) for sentence in sentences if sentence.strip())
+        sentence_lengths = view.sentence_word_counts
+        avg_length = sum(sentence_lengths) / len(sentence_lengths) if sentence_lengths else 0
         
         if avg_length > 25:
-            issues.append(IssueReport(
-                issue_id="style_001",
-                severity="minor",
-                category="style",
-                description="الجمل طويلة جداً",
-                location="النص بأكمله",
-                suggested_fix="تقسيم الجمل الطويلة إلى جمل أقصر",
-                impact_assessment="قد يؤثر على سهولة القراءة",
-                priority=4
-            ))
+            issues.append(IssueReport(*self._STYLE_LONG_SENTENCES))
         
         return issues
 
-    async def _detect_language_issues(self, narrative: str) -> List[IssueReport]:
+    def _detect_language_issues(self, view: NarrativeView) -> List[IssueReport]:
         """كشف مشاكل اللغة"""
         issues = []
         
-        # فحص التكرار المفرط
-        words = narrative.split()
-        word_counts = Counter(words)
-        
-        for word, count in word_counts.most_common(5):
-            if count > len(words) * 0.05 and len(word) > 3:  # أكثر من 5% من النص
+        # فحص التكرار المفرط (أكثر من 5% من النص)
+        threshold = view.word_count * 0.05
+        for word, count in view.counter.most_common(5):
+            if count <= threshold:
+                break  # most_common مرتبة تنازليًا، فلن تتجاوز الكلمات التالية العتبة
+            if len(word) > 3:
                 issues.append(IssueReport(
-                    issue_id=f"lang_001_{word}",
-                    severity="minor",
-                    category="language",
-                    description=f"تكرار مفرط للكلمة: {word}",
-                    location="النص بأكمله",
-                    suggested_fix=f"استخدام مرادفات للكلمة {word}",
-                    impact_assessment="قد يؤثر على تنوع المفردات",
-                    priority=3
+                    f"lang_001_{word}", "minor", "language", f"تكرار مفرط للكلمة: {word}", "النص بأكمله",
+                    f"استخدام مرادفات للكلمة {word}", "قد يؤثر على تنوع المفردات", 3
                 ))
         
         return issues
 
-    async def _detect_structure_issues(self, narrative: str) -> List[IssueReport]:
+    def _detect_structure_issues(self, narrative: str) -> List[IssueReport]:
         """كشف مشاكل البنية"""
         issues = []
         
@@ -567,22 +652,18 @@ class FusionArbitratorAgent(BaseAgent):
         paragraphs = narrative.split('\n\n')
         
         if len(paragraphs) < 3:
-            issues.append(IssueReport(
-                issue_id="struct_001",
-                severity="minor",
-                category="structure",
-                description="النص يحتاج لتقسيم أفضل إلى فقرات",
-                location="النص بأكمله",
-                suggested_fix="تقسيم النص إلى فقرات منطقية",
-                impact_assessment="يحسن من تنظيم النص",
-                priority=4
-            ))
+            issues.append(IssueReport(*self._STRUCT_FEW_PARAGRAPHS))
         
         return issues
 
-    async def _generate_recommendations(self, quality_metrics: QualityMetrics,
-                                      issues: List[IssueReport],
-                                      metadata: Dict[str, Any]) -> List[str]:
+    @staticmethod
+    def _count_severities(issues: List[IssueReport]) -> Counter:
+        """عدد المشاكل لكل مستوى خطورة ('critical', 'major', ...) في مرور واحد"""
+        return Counter(issue.severity for issue in issues)
+
+    def _generate_recommendations(self, quality_metrics: QualityMetrics,
+                                severity_counts: Counter,
+                                metadata: Dict[str, Any]) -> List[str]:
         """توليد التوصيات بناء على التحليل"""
         recommendations = []
         
@@ -597,12 +678,10 @@ class FusionArbitratorAgent(BaseAgent):
             recommendations.append("إضافة عناصر إبداعية أكثر لجعل القصة أكثر تميزاً")
         
         # توصيات بناء على المشاكل المكتشفة
-        critical_issues = [issue for issue in issues if issue.severity == 'critical']
-        if critical_issues:
+        if severity_counts['critical']:
             recommendations.append("معالجة المشاكل الحرجة المكتشفة كأولوية قصوى")
         
-        major_issues = [issue for issue in issues if issue.severity == 'major']
-        if len(major_issues) > 2:
+        if severity_counts['major'] > 2:
             recommendations.append("مراجعة وإصلاح المشاكل الرئيسية المتعددة")
         
         if quality_metrics.readability_score < 0.7:
@@ -610,8 +689,8 @@ class FusionArbitratorAgent(BaseAgent):
         
         return recommendations
 
-    async def _develop_improvement_suggestions(self, narrative: str, issues: List[IssueReport],
-                                             quality_metrics: QualityMetrics) -> List[Dict[str, Any]]:
+    def _develop_improvement_suggestions(self, narrative: str, issues: List[IssueReport],
+                                       quality_metrics: QualityMetrics) -> List[Dict[str, Any]]:
         """تطوير اقتراحات التحسين المفصلة"""
         suggestions = []
         
@@ -647,18 +726,15 @@ class FusionArbitratorAgent(BaseAgent):
         
         return suggestions
 
-    async def _determine_approval_status(self, quality_metrics: QualityMetrics,
-                                       issues: List[IssueReport]) -> str:
+    def _determine_approval_status(self, quality_metrics: QualityMetrics,
+                                 severity_counts: Counter) -> str:
         """تحديد حالة الموافقة على النص"""
-        critical_issues = [i for i in issues if i.severity == 'critical']
-        major_issues = [i for i in issues if i.severity == 'major']
-        
         # رفض في حالة وجود مشاكل حرجة
-        if critical_issues:
+        if severity_counts['critical']:
             return 'major_revision'
         
         # مراجعة في حالة جودة منخفضة أو مشاكل رئيسية متعددة
-        if quality_metrics.overall_quality < 0.6 or len(major_issues) > 3:
+        if quality_metrics.overall_quality < 0.6 or severity_counts['major'] > 3:
             return 'needs_revision'
         
         # موافقة في حالة الجودة المقبولة
@@ -667,8 +743,8 @@ class FusionArbitratorAgent(BaseAgent):
         
         return 'needs_revision'
 
-    async def _calculate_confidence_level(self, quality_metrics: QualityMetrics,
-                                        issues: List[IssueReport]) -> float:
+    def _calculate_confidence_level(self, quality_metrics: QualityMetrics,
+                                  issues: List[IssueReport]) -> float:
         """حساب مستوى الثقة في التقييم"""
         base_confidence = 0.8
         
@@ -682,82 +758,35 @@ class FusionArbitratorAgent(BaseAgent):
         return max(0.3, min(1.0, confidence))
 
     # وظائف مساعدة إضافية للتقييمات المتقدمة
-    async def _assess_grammar_quality(self, narrative: str) -> float:
-        """تقييم الجودة النحوية (محاكاة)"""
-        # في التطبيق الفعلي، ستستخدم أدوات تحليل نحوي متقدمة
-        return 0.85
-
-    async def _assess_punctuation_quality(self, narrative: str) -> float:
+    def _assess_punctuation_quality(self, view: NarrativeView) -> float:
         """تقييم جودة الترقيم"""
-        sentences = re.split(r'[.!?]+', narrative)
-        punctuated_sentences = len([s for s in sentences if s.strip()])
+        sentences = view.sentences
+        punctuated_sentences = len(view.sentence_word_counts)
         return min(punctuated_sentences / len(sentences), 1.0) if sentences else 0.5
 
-    async def _assess_structure_quality(self, narrative: str) -> float:
+    def _assess_structure_quality(self, narrative: str) -> float:
         """تقييم جودة البنية"""
         paragraphs = narrative.split('\n\n')
         return min(len(paragraphs) / 5, 1.0)
 
-    async def _assess_vocabulary_quality(self, narrative: str) -> float:
+    def _assess_vocabulary_quality(self, view: NarrativeView) -> float:
         """تقييم جودة المفردات"""
-        words = narrative.split()
-        unique_words = set(words)
-        return len(unique_words) / len(words) if words else 0
+        # مفاتيح العداد هي الكلمات الفريدة نفسها
+        return len(view.counter) / view.word_count if view.word_count else 0
 
-    async def _evaluate_cultural_sensitivity(self, narrative: str) -> float:
+    def _evaluate_cultural_sensitivity(self, view: NarrativeView) -> float:
         """تقييم الحساسية الثقافية"""
         # فحص وجود عناصر ثقافية إيجابية
-        positive_cultural = ['تراث', 'أصالة', 'كرم', 'ضيافة', 'شهامة']
-        return min(sum(narrative.count(word) for word in positive_cultural) / 10, 1.0)
+        return min(view.group_hits['cultural'] / 10, 1.0)
 
-    async def _evaluate_readability(self, narrative: str) -> float:
+    def _evaluate_readability(self, view: NarrativeView) -> float:
         """تقييم سهولة القراءة"""
-        sentences = re.split(r'[.!?]+', narrative)
-        words = narrative.split()
-        avg_sentence_length = len(words) / len(sentences) if sentences else 0
-        
-        # كلما قل طول الجملة، زادت سهولة القراءة
-        return max(0, 1 - (avg_sentence_length - 15) / 25) if avg_sentence_length > 15 else 1.0
+        return _readability_score(view.word_count, len(view.sentences))
 
-    async def _evaluate_emotional_resonance(self, narrative: str) -> float:
+    def _evaluate_emotional_resonance(self, view: NarrativeView) -> float:
         """تقييم الرنين العاطفي"""
-        emotional_words = ['حب', 'حزن', 'فرح', 'خوف', 'أمل', 'يأس', 'سعادة']
-        emotional_count = sum(narrative.lower().count(word) for word in emotional_words)
-        return min(emotional_count / len(narrative.split()) * 10, 1.0)
-
-    # باقي الوظائف المساعدة للتقييمات المتخصصة...
-    async def _check_style_consistency(self, narrative: str) -> float:
-        return 0.8  # محاكاة
-
-    async def _check_information_consistency(self, narrative: str) -> float:
-        return 0.85  # محاكاة
-
-    async def _check_perspective_consistency(self, narrative: str) -> float:
-        return 0.8  # محاكاة
-
-    async def _check_language_authenticity(self, narrative: str) -> float:
-        return 0.85  # محاكاة
-
-    async def _check_dialogue_authenticity(self, narrative: str) -> float:
-        return 0.8  # محاكاة
-
-    async def _check_description_authenticity(self, narrative: str) -> float:
-        return 0.85  # محاكاة
-
-    async def _check_cultural_context_authenticity(self, narrative: str) -> float:
-        return 0.9  # محاكاة
-
-    async def _assess_plot_innovation(self, narrative: str, sources: List[str]) -> float:
-        return 0.75  # محاكاة
-
-    async def _assess_character_innovation(self, narrative: str, sources: List[str]) -> float:
-        return 0.8  # محاكاة
-
-    async def _assess_style_innovation(self, narrative: str, sources: List[str]) -> float:
-        return 0.7  # محاكاة
-
-    async def _assess_treatment_innovation(self, narrative: str, sources: List[str]) -> float:
-        return 0.75  # محاكاة
+        emotional_count = view.group_hits['emotional']
+        return _density_score(emotional_count, view.word_count, 10)
 
 # مثال على الاستخدام
 async def main():
@@ -1,9 +1,14 @@
 # agents/fusion_synthesizer_agent.py (وكيل جديد)
+import asyncio
+import copy
+import json
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 
 from .base_agent import BaseAgent
 from ..core.llm_service import llm_service
+from ..core.llm_cache import ResponseCache, cached_json, content_digest, llm_singleflight
+from ..core.concurrency import LoopBoundSemaphore
 # هذا الوكيل سيستدعي وكلاء آخرين لتحليل المصادر
 from .soul_profiler_agent import soul_profiler_agent
 from .blueprint_architect_agent import blueprint_architect
@@ -11,6 +16,50 @@ from .fusion_arbitrator_agent import fusion_arbitrator_agent
 
 logger = logging.getLogger("FusionSynthesizerAgent")
 
+# سقف لعدد تحليلات SoulProfiler المتزامنة عندما تكثر المصادر
+_PROFILER_SEMAPHORE = LoopBoundSemaphore(5)
+
+# التعليمات الثابتة تأتي أولاً والبيانات المتغيرة (الهويات والاستراتيجية) في آخر الـ prompt،
+# فتبقى المقدمة مطابقة حرفيًا بين الطلبات ويستطيع مزود LLM إعادة استخدام تخزينها المؤقت.
+_COMPAT_TPL = """
+مهمتك: أنت ناقد أدبي وخبير في نظرية السرد المقارن. لديك الهويات السردية لعدة أعمال أدبية، وهي واردة في آخر هذه الرسالة.
+
+**المطلوب:**
+1.  **احسب "درجة التوافق" (compatibility_score)** بين هذه الأعمال (من 0.0 إلى 1.0)، حيث 1.0 يعني توافقًا تامًا.
+2.  **حدد "نقاط التوتر" (tension_points):** العناصر التي قد تتعارض بشدة (مثل قيم الشخصيات، قوانين العالم).
+3.  **حدد "نقاط الانسجام" (harmony_points):** العناصر المشتركة التي يمكن أن تكون أساسًا للدمج (مثل المواضيع المتشابهة).
+4.  **اقترح "استراتيجية الدمج المثلى" (optimal_fusion_strategy):** (مثال: "دمج شخصية من المصدر أ في عالم المصدر ب"، "كتابة قصة جديدة تجمع بين أسلوب أ وموضوع ب").
+
+أرجع ردك **حصريًا** بتنسيق JSON.
+
+**الهويات السردية للمصادر:**
+{identities_text}
+"""
+
+_SYNTH_TPL = """
+مهمتك: أنت روائي تجريبي عبقري، قادر على دمج عوالم وأساليب مختلفة في عمل فني واحد متماسك.
+
+**المطلوب:**
+اكتب الفصل الأول من عمل هجين يدمج المصادر الواردة في آخر هذه الرسالة وفق مخطط الاندماج المرفق معها. يجب أن يكون النص الناتج متماسكًا، ومبدعًا، ويحترم استراتيجية الدمج المحددة. اكتب باللغة العربية الفصحى وبأسلوب أدبي رفيع.
+
+**مخطط واستراتيجية الاندماج المطلوبة:**
+{strategy}
+
+**الهويات السردية للمصادر:**
+{identities_text}
+
+**الفصل الأول:**
+"""
+
+_IDENTITY_SEPARATOR = "\n\n---\n\n"
+
+def _serialize_identity(identity: Dict[str, Any]) -> str:
+    """تسلسل ثابت للهوية: القواميس المتساوية تعطي نصًا متطابقًا بايتًا ببايت مهما كان ترتيب مفاتيحها."""
+    return json.dumps(identity, sort_keys=True, ensure_ascii=False, default=str)
+
+def _join_identities(identities: List[Dict[str, Any]]) -> str:
+    return _IDENTITY_SEPARATOR.join(_serialize_identity(identity) for identity in identities)
+
 class FusionSynthesizerAgent(BaseAgent):
     """
     وكيل "الاندماج والتخليق السردي".
@@ -22,6 +71,8 @@ class FusionSynthesizerAgent(BaseAgent):
             name="مُخلِّق السرد الفائق",
             description="يدمج بين عوالم وشخصيات وأساليب مختلفة لخلق أعمال جديدة."
         )
+        # الهويات السردية حسب بصمة نص المصدر: إعادة تحليل نفس المصدر (مثل إضافة مصدر ثالث لدمج سابق) لا تستدعي LLM
+        self._identity_cache = ResponseCache(max_entries=256, ttl=None)
 
     async def process_task(self, context: Dict[str, Any], **kwargs) -> Dict[str, Any]:
         """
@@ -35,6 +86,8 @@ class FusionSynthesizerAgent(BaseAgent):
             return await self.analyze_compatibility(context)
         elif task_type == "synthesize_narrative":
             return await self.synthesize_narrative(context)
+        elif task_type == "fuse":
+            return await self.fuse(context.get("sources", []), context.get("fusion_blueprint"))
         else:
             return {"status": "error", "message": f"Unknown fusion task type: {task_type}"}
 
@@ -50,16 +103,12 @@ class FusionSynthesizerAgent(BaseAgent):
 
         logger.info(f"Analyzing compatibility between {len(sources)} narrative sources...")
         
-        # 1. تحليل الهوية السردية لكل مصدر
-        narrative_identities = []
-        for src in sources:
-            # استخدام SoulProfiler لتحليل الأسلوب والشخصيات والمواضيع
-            identity = await soul_profiler_agent.process_task({"text_content": src["content"]})
-            narrative_identities.append(identity.get("profile", {}))
+        # 1. تحليل الهوية السردية لكل مصدر (التحليلات مستقلة، فتُرسل بشكل متوازٍ)
+        narrative_identities = await self._profile_sources(sources)
 
         # 2. تقييم التوافق باستخدام LLM
         prompt = self._build_compatibility_prompt(narrative_identities)
-        compatibility_report = await llm_service.generate_json_response(prompt, temperature=0.2)
+        compatibility_report = await cached_json(prompt, 0.2)
 
         return {
             "status": "success",
@@ -70,22 +119,58 @@ class FusionSynthesizerAgent(BaseAgent):
             "summary": "Compatibility analysis complete."
         }
 
-    def _build_compatibility_prompt(self, identities: List[Dict]) -> str:
-        identities_text = "\n\n---\n\n".join([str(identity) for identity in identities])
-        return f"""
-مهمتك: أنت ناقد أدبي وخبير في نظرية السرد المقارن. لديك الهويات السردية لعدة أعمال أدبية.
-
-**الهويات السردية للمصادر:**
-{identities_text}
-
-**المطلوب:**
-1.  **احسب "درجة التوافق" (compatibility_score)** بين هذه الأعمال (من 0.0 إلى 1.0)، حيث 1.0 يعني توافقًا تامًا.
-2.  **حدد "نقاط التوتر" (tension_points):** العناصر التي قد تتعارض بشدة (مثل قيم الشخصيات، قوانين العالم).
-3.  **حدد "نقاط الانسجام" (harmony_points):** العناصر المشتركة التي يمكن أن تكون أساسًا للدمج (مثل المواضيع المتشابهة).
-4.  **اقترح "استراتيجية الدمج المثلى" (optimal_fusion_strategy):** (مثال: "دمج شخصية من المصدر أ في عالم المصدر ب"، "كتابة قصة جديدة تجمع بين أسلوب أ وموضوع ب").
+    async def _profile_sources(self, sources: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        يعيد الهوية السردية لكل مصدر بنفس ترتيب المصادر.
+        المصادر المخزنة تُعاد مباشرة، والمصادر المكررة في نفس الطلب تُحلل مرة واحدة.
+        """
+        keys = [content_digest(src.get("content", "")) for src in sources]
+        profiles: Dict[str, Dict[str, Any]] = {}
+        pending: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+        for index, (key, src) in enumerate(zip(keys, sources)):
+            if key in profiles or key in pending:
+                continue
+            cached = self._identity_cache.get(key)
+            if cached is not None:
+                profiles[key] = cached
+            else:
+                pending[key] = (index, src)
+
+        # التحليلات مستقلة، فتُرسل بشكل متوازٍ
+        results = await asyncio.gather(
+            *(self._profile_source(key, src) for key, (_, src) in pending.items()), return_exceptions=True
+        )
+        for (key, (index, _)), profile in zip(pending.items(), results):
+            if isinstance(profile, Exception):
+                # فشل مصدر واحد لا يُفشل التحليل كله: يُعامل كمصدر بلا ملف
+                logger.warning(f"Soul profiling failed for source #{index}: {profile}")
+                continue
+            profiles[key] = profile
+
+        # المصادر المكررة تحصل على نسخ مستقلة من الهوية نفسها
+        identities = []
+        seen = set()
+        for key in keys:
+            profile = profiles.get(key, {})
+            identities.append(copy.deepcopy(profile) if key in seen else profile)
+            seen.add(key)
+        return identities
+
+    async def _profile_source(self, key: str, src: Dict[str, Any]) -> Dict[str, Any]:
+        # الطلبات المتزامنة لنفس المصدر (من مهام دمج مختلفة) تنتظر تحليلاً واحدًا
+        identity = await llm_singleflight.do(("soul_profile", key), lambda: self._run_profiler(src))
+        profile = identity.get("profile", {})
+        if identity.get("status") != "error":
+            self._identity_cache.set(key, profile)
+        return profile
+
+    async def _run_profiler(self, src: Dict[str, Any]) -> Dict[str, Any]:
+        """يستخدم SoulProfiler لتحليل الأسلوب والشخصيات والمواضيع لمصدر واحد."""
+        async with _PROFILER_SEMAPHORE:
+            return await soul_profiler_agent.process_task({"text_content": src["content"]})
 
-أرجع ردك **حصريًا** بتنسيق JSON.
-"""
+    def _build_compatibility_prompt(self, identities: List[Dict]) -> str:
+        return _COMPAT_TPL.format(identities_text=_join_identities(identities))
 
     async def synthesize_narrative(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -102,41 +187,57 @@ class FusionSynthesizerAgent(BaseAgent):
             
         logger.info(f"Synthesizing new narrative based on strategy: '{blueprint.get('fusion_strategy')}'")
 
-        # بناء الـ prompt النهائي للتخليق
-        prompt = self._build_synthesis_prompt(blueprint, identities)
-        synthesized_text = await llm_service.generate_text_response(prompt, temperature=0.8)
-
-        # التحكيم الأولي في جودة المخرج
-        arbitration_report = await fusion_arbitrator_agent.process_task({"synthesized_narrative": synthesized_text})
+        synthesized_text, arbitration = await self._synthesize_and_arbitrate(blueprint, identities)
 
         return {
             "status": "success",
             "content": {
                 "synthesized_narrative": synthesized_text,
-                "initial_arbitration": arbitration_report.get("content")
+                "initial_arbitration": arbitration
             },
             "summary": "Narrative synthesis and initial arbitration complete."
         }
 
-    def _build_synthesis_prompt(self, blueprint: Dict, identities: List[Dict]) -> str:
-        # هذا الـ prompt هو قلب العملية الإبداعية، وسيكون معقدًا جدًا
-        # يعتمد على تفاصيل المخطط. هذا مثال مبسط.
-        strategy = blueprint.get("fusion_strategy", "No strategy defined.")
-        
-        return f"""
-مهمتك: أنت روائي تجريبي عبقري، قادر على دمج عوالم وأساليب مختلفة في عمل فني واحد متماسك.
+    async def fuse(self, sources: List[Dict[str, Any]], fusion_blueprint: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        ينفذ الدمج كاملاً في استدعاء واحد: تحليل هويات المصادر ثم التخليق والتحكيم الأولي.
+        يغني عن استدعاء analyze_compatibility ثم تمرير هوياته إلى synthesize_narrative،
+        فالهويات تنتقل إلى التخليق مباشرة دون المرور بـ process_task مرتين.
+        """
+        if len(sources) < 2:
+            return {"status": "error", "message": "At least two sources are required for fusion."}
+        if not fusion_blueprint:
+            return {"status": "error", "message": "Fusion blueprint is required."}
 
-**الهويات السردية للمصادر:**
-{identities}
+        logger.info(f"Fusing {len(sources)} narrative sources with strategy: '{fusion_blueprint.get('fusion_strategy')}'")
 
-**مخطط واستراتيجية الاندماج المطلوبة:**
-{strategy}
+        identities = await self._profile_sources(sources)
+        synthesized_text, arbitration = await self._synthesize_and_arbitrate(fusion_blueprint, identities)
 
-**المطلوب:**
-اكتب الآن الفصل الأول من هذا العمل الهجين. يجب أن يكون النص الناتج متماسكًا، ومبدعًا، ويحترم استراتيجية الدمج المحددة. اكتب باللغة العربية الفصحى وبأسلوب أدبي رفيع.
+        return {
+            "status": "success",
+            "content": {
+                "narrative_identities": identities,
+                "synthesized_narrative": synthesized_text,
+                "initial_arbitration": arbitration
+            },
+            "summary": "Narrative fusion and initial arbitration complete."
+        }
 
-**الفصل الأول:**
-"""
+    async def _synthesize_and_arbitrate(self, blueprint: Dict, identities: List[Dict]) -> Tuple[str, Any]:
+        # بناء الـ prompt النهائي للتخليق
+        prompt = self._build_synthesis_prompt(blueprint, identities)
+        synthesized_text = await llm_service.generate_text_response(prompt, temperature=0.8)
+
+        # التحكيم الأولي في جودة المخرج
+        arbitration_report = await fusion_arbitrator_agent.process_task({"synthesized_narrative": synthesized_text})
+        return synthesized_text, arbitration_report.get("content")
+
+    def _build_synthesis_prompt(self, blueprint: Dict, identities: List[Dict]) -> str:
+        # هذا الـ prompt هو قلب العملية الإبداعية، وسيكون معقدًا جدًا
+        # يعتمد على تفاصيل المخطط. هذا مثال مبسط.
+        strategy = blueprint.get("fusion_strategy", "No strategy defined.")
+        return _SYNTH_TPL.format(strategy=strategy, identities_text=_join_identities(identities))
 
 # إنشاء مثيل وحيد
 fusion_synthesizer_agent = FusionSynthesizerAgent()
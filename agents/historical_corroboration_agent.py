@@ -1,19 +1,54 @@
 # agents/historical_corroboration_agent.py (وكيل جديد)
+import copy
 import logging
-from typing import Dict, Any, Optional, List
+from difflib import SequenceMatcher
+from typing import Dict, Any, Optional, List, Tuple
 import asyncio
 
 from .base_agent import BaseAgent
 from ..services.web_search_service import web_search_service
-from ..core.llm_service import llm_service
+from ..core.llm_cache import ResponseCache, cached_json, llm_singleflight
+from ..core.concurrency import LoopBoundSemaphore
+from ..core.arabic_text import normalize_arabic
 
 logger = logging.getLogger("HistoricalCorroborationAgent")
 
+def _claim_key(claim: str) -> str:
+    """صيغة موحدة للادعاء تُستخدم لاكتشاف التكرار (توحيد الكتابة العربية والمسافات)."""
+    return " ".join(normalize_arabic(claim).split())
+
+_ANALYSIS_PROMPT_TEMPLATE = """
+مهمتك: أنت مؤرخ وباحث أكاديمي. سيتم تزويدك في آخر هذه الرسالة بادعاء تاريخي ومجموعة من المصادر. قم بتقييم صحة الادعاء.
+
+**المطلوب:**
+بناءً على هذه المصادر، قدم تقييماً لصحة الادعاء في صيغة JSON:
+- **claim:** الادعاء الأصلي.
+- **certainty_level:** درجة اليقين (مؤكد، محتمل، مشكوك فيه، غير صحيح).
+- **evidence_summary:** ملخص للأدلة التي تدعم أو تدحض الادعاء.
+- **conflicting_views:** أي وجهات نظر متعارضة تم العثور عليها.
+- **confidence_score:** درجة ثقتك في هذا التقييم (من 0.0 إلى 1.0).
+
+**الادعاء التاريخي:**
+"{claim}"
+
+**ملخص المصادر التي تم العثور عليها:**
+{sources}
+
+**التقييم (JSON):**
+"""
+
 class HistoricalCorroborationAgent(BaseAgent):
     """
     وكيل "المؤرخ المدقق".
     متخصص في التحقق من صحة الادعاءات التاريخية عبر مقارنة مصادر متعددة.
     """
+    # قوالب استعلامات البحث لكل ادعاء
+    _Q_TPL = (
+        '"{claim}" site:.edu OR site:.gov OR site:.org', # بحث أكاديمي وحكومي
+        'أرشيف الأخبار حول "{claim}"',
+        'تاريخ القانون المتعلق بـ "{root}"',
+    )
+
     def __init__(self, agent_id: Optional[str] = None):
         super().__init__(
             agent_id=agent_id or "historical_corroborator",
@@ -21,22 +56,48 @@ class HistoricalCorroborationAgent(BaseAgent):
             description="يتحقق من الحقائق التاريخية عبر البحث الأكاديمي والأرشيفي."
         )
         self.web_service = web_search_service
+        # سقف للتزامن: دفعة كبيرة من الادعاءات قد تتجاوز حدود مزود LLM
+        self._llm_sem = LoopBoundSemaphore(4)
+        # نفس الادعاء يتكرر عادةً بين مراجعات المخطوطة نفسها، فيُحفظ تقييمه حسب نصه
+        self._claim_cache = ResponseCache(max_entries=4096, ttl=24 * 3600)
 
     async def corroborate_claims(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """
         الوظيفة الرئيسية: يأخذ قائمة من الادعاءات ويقدم تقريرًا عن درجة اليقين التاريخي.
         'context' يجب أن يحتوي على:
         - claims: قائمة بالادعاءات المستخلصة من FactCheckerAgent.
+        - force_refresh: (اختياري) تجاهل التقييمات المخزنة وإعادة التحقق من كل الادعاءات.
+        - dedupe_threshold: (اختياري) نسبة تشابه (0.0-1.0) يُعامل فوقها ادعاءان كصياغتين لنفس الادعاء.
         """
         claims = context.get("claims", [])
         if not claims:
             return {"status": "success", "content": {"corroboration_report": []}, "summary": "No historical claims to corroborate."}
 
+        # force_refresh يتجاوز التقييمات المخزنة لادعاءات هذا الطلب وحدها ويستبدلها بالنتائج الجديدة
+        force_refresh = bool(context.get("force_refresh"))
+
         logger.info(f"Historian: Corroborating {len(claims)} historical claims...")
         
+        # الادعاءات المكررة يُتحقق منها مرة واحدة
+        unique_claims, claim_slots = self._dedupe_claims(claims, context.get("dedupe_threshold"))
+
         # تنفيذ التحقق لكل ادعاء بشكل متوازٍ
-        corroboration_tasks = [self._verify_single_claim(claim) for claim in claims]
-        report = await asyncio.gather(*corroboration_tasks)
+        corroboration_tasks = [self._verify_single_claim(claim, refresh=force_refresh) for claim in unique_claims]
+        results = await asyncio.gather(*corroboration_tasks, return_exceptions=True)
+        unique_reports = []
+        for claim, result in zip(unique_claims, results):
+            if isinstance(result, Exception):
+                # فشل ادعاء واحد لا يُسقط الدفعة كلها
+                logger.warning(f"Corroboration failed for claim '{claim}': {result}")
+                result = {"claim": claim, "error": str(result)}
+            unique_reports.append(result)
+
+        # كل ادعاء مكرر يحصل على نسخة مستقلة من تقرير الادعاء الذي يمثله
+        report = []
+        reported = set()
+        for slot in claim_slots:
+            report.append(copy.deepcopy(unique_reports[slot]) if slot in reported else unique_reports[slot])
+            reported.add(slot)
 
         return {
             "status": "success",
@@ -44,48 +105,70 @@ class HistoricalCorroborationAgent(BaseAgent):
             "summary": f"Corroborated {len(claims)} claims."
         }
 
-    async def _verify_single_claim(self, claim: str) -> Dict:
+    @staticmethod
+    def _dedupe_claims(claims: List[str], threshold: Optional[float] = None) -> Tuple[List[str], List[int]]:
+        """
+        يعيد الادعاءات الفريدة (بترتيب أول ظهور) وموقع الادعاء الممثل لكل ادعاء في القائمة الأصلية.
+        التطابق يكون على الصيغة الموحدة، ومع threshold تُدمج أيضًا الصياغات شبه المتطابقة.
+        """
+        unique_claims: List[str] = []
+        unique_keys: List[str] = []
+        slot_by_key: Dict[str, int] = {}
+        claim_slots: List[int] = []
+        for claim in claims:
+            key = _claim_key(claim)
+            slot = slot_by_key.get(key)
+            if slot is None and threshold is not None:
+                for candidate_slot, candidate_key in enumerate(unique_keys):
+                    matcher = SequenceMatcher(None, key, candidate_key)
+                    # quick_ratio حد أعلى رخيص للنسبة، فيُستبعد به معظم الأزواج قبل الحساب الكامل
+                    if matcher.quick_ratio() >= threshold and matcher.ratio() >= threshold:
+                        slot = candidate_slot
+                        break
+            if slot is None:
+                slot = len(unique_claims)
+                unique_claims.append(claim)
+                unique_keys.append(key)
+            slot_by_key[key] = slot
+            claim_slots.append(slot)
+        return unique_claims, claim_slots
+
+    async def _verify_single_claim(self, claim: str, refresh: bool = False) -> Dict:
+        """يتحقق من صحة ادعاء واحد، مع إعادة استخدام تقييم سابق لنفس الادعاء إن وُجد."""
+        # المفتاح الموحد نفسه المستخدم في إزالة التكرار: اختلاف التشكيل أو المسافات لا يعيد التحقق
+        key = _claim_key(claim)
+        if not refresh:
+            cached = self._claim_cache.get(key)
+            if cached is not None:
+                return cached
+
+        result = await llm_singleflight.do(("historical_claim", key), lambda: self._analyze_claim(claim, refresh))
+        if not (isinstance(result, dict) and "error" in result):
+            self._claim_cache.set(key, result)
+        return result
+
+    async def _analyze_claim(self, claim: str, refresh: bool) -> Dict:
         """يتحقق من صحة ادعاء واحد عبر البحث المتقاطع."""
         logger.info(f"Verifying: '{claim}'")
         
         # 1. صياغة استعلامات بحث متنوعة
-        search_queries = [
-            f'"{claim}" site:.edu OR site:.gov OR site:.org', # بحث أكاديمي وحكومي
-            f'أرشيف الأخبار حول "{claim}"',
-            f'تاريخ القانون المتعلق بـ "{claim.split("في عام")[0]}"'
-        ]
+        # جذر الادعاء (ما قبل "في عام") يُحسب مرة واحدة؛ partition لا تقسم بقية النص
+        root = claim.partition("في عام")[0]
+        search_queries = tuple(template.format(claim=claim, root=root) for template in self._Q_TPL)
         
         # 2. البحث عن مصادر (محاكاة)
         # في نظام حقيقي، سننفذ هذه البحوث ونحلل النتائج
-        # search_results = await asyncio.gather(*[self.web_service.search(q) for q in search_queries])
         
         # 3. تحليل النتائج بواسطة LLM (محاكاة)
         # لنفترض أننا وجدنا مصادر تدعم الادعاء
         prompt = self._build_analysis_prompt(claim, ["مصدر أكاديمي 1", "مقال صحفي من الأرشيف"])
-        analysis_result = await llm_service.generate_json_response(prompt, temperature=0.1)
+        async with self._llm_sem:
+            analysis_result = await cached_json(prompt, 0.1, refresh=refresh)
 
         return analysis_result
 
     def _build_analysis_prompt(self, claim: str, sources: List[str]) -> str:
-        return f"""
-مهمتك: أنت مؤرخ وباحث أكاديمي. لقد تم تزويدك بادعاء تاريخي ومجموعة من المصادر. قم بتقييم صحة الادعاء.
-
-**الادعاء التاريخي:**
-"{claim}"
-
-**ملخص المصادر التي تم العثور عليها:**
-{sources}
-
-**المطلوب:**
-بناءً على هذه المصادر، قدم تقييماً لصحة الادعاء في صيغة JSON:
-- **claim:** الادعاء الأصلي.
-- **certainty_level:** درجة اليقين (مؤكد، محتمل، مشكوك فيه، غير صحيح).
-- **evidence_summary:** ملخص للأدلة التي تدعم أو تدحض الادعاء.
-- **conflicting_views:** أي وجهات نظر متعارضة تم العثور عليها.
-- **confidence_score:** درجة ثقتك في هذا التقييم (من 0.0 إلى 1.0).
-
-**التقييم (JSON):**
-"""
+        return _ANALYSIS_PROMPT_TEMPLATE.format(claim=claim, sources=sources)
 
     async def process_task(self, context: Dict[str, Any], **kwargs) -> Dict[str, Any]:
         return await self.corroborate_claims(context)
@@ -4,16 +4,40 @@ IdeaCriticAgent (ناقد الأفكار)
 يقوم بتقييم الأفكار الإبداعية من حيث الأصالة والجاذبية وقابلية التطوير.
 """
 import logging
-from typing import Dict, Any, List
+import re
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Any, List, Optional, Tuple
 
 from .base_agent import BaseAgent
+from ..core.arabic_text import KeywordScanner
 
 logger = logging.getLogger("IdeaCriticAgent")
 
+# عبارات الأفكار المستهلكة، وعناصر التشويق التي يُنتظر وجود إحداها على الأقل
+_CLICHES = frozenset({"تاريخ مزيف", "اكتشاف سر"})
+_HOOKS = frozenset({"منظمة سرية", "مطارد"})
+
+# ماسح واحد يمر على الفكرة مرة واحدة لكل العبارات بدل فحص "in" مستقل لكل عبارة
+_KEYWORD_SCANNER = KeywordScanner({"cliche": _CLICHES, "hook": _HOOKS})
+_WORD_RE = re.compile(r"\S+")
+
+_MIN_PREMISE_WORDS = 10
+
 class IdeaCriticAgent(BaseAgent):
     """
     وكيل متخصص في نقد وتقييم الأفكار الإبداعية.
     """
+    # جدول قواعد التقييم: (عبارات يكفي وجود إحداها، عبارات يُنتظر وجود إحداها، الحد الأدنى للكلمات، الخصم، الملاحظة)
+    _RULES = (
+        # تقييم الأصالة (هل الفكرة مبتكرة أم مكررة؟)
+        (_CLICHES, None, 0, 1.5, "الفكرة تحتوي على عناصر شائعة. حاول إيجاد زاوية جديدة وفريدة."),
+        # تقييم القابلية للتطوير (هل يمكن بناء رواية كاملة عليها؟)
+        (None, None, _MIN_PREMISE_WORDS, 1.0, "الفكرة الأساسية موجزة جدًا. تحتاج إلى تفاصيل أكثر لتحديد إمكانية تطويرها."),
+        # تقييم الجاذبية (هل الفكرة مثيرة للاهتمام؟)
+        (None, _HOOKS, 0, 1.0, "الفكرة تفتقر إلى عنصر تشويق أو صراع واضح لجذب القارئ."),
+    )
+
     def __init__(self, agent_id: Optional[str] = None):
         super().__init__(
             agent_id=agent_id,
@@ -26,29 +50,49 @@ class IdeaCriticAgent(BaseAgent):
         الوظيفة الرئيسية: يراجع فكرة قصة ويعطي تقييمًا وملاحظات.
         """
         logger.info(f"Reviewing idea: '{idea_content.get('premise', 'N/A')}'")
+        return self._review(idea_content.get("premise", ""))
 
-        issues: List[str] = []
-        score = 10.0
-
-        premise = idea_content.get("premise", "")
-        
-        # تقييم الأصالة (هل الفكرة مبتكرة أم مكررة؟)
-        if "تاريخ مزيف" in premise or "اكتشاف سر" in premise:
-            score -= 1.5
-            issues.append("الفكرة تحتوي على عناصر شائعة. حاول إيجاد زاوية جديدة وفريدة.")
-        
-        # تقييم القابلية للتطوير (هل يمكن بناء رواية كاملة عليها؟)
-        if len(premise.split()) < 10:
-            score -= 1.0
-            issues.append("الفكرة الأساسية موجزة جدًا. تحتاج إلى تفاصيل أكثر لتحديد إمكانية تطويرها.")
-            
-        # تقييم الجاذبية (هل الفكرة مثيرة للاهتمام؟)
-        if "منظمة سرية" not in premise and "مطارد" not in premise:
-            score -= 1.0
-            issues.append("الفكرة تفتقر إلى عنصر تشويق أو صراع واضح لجذب القارئ.")
+    def review_ideas(self, ideas: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        يراجع دفعة من الأفكار (مثل مرشحي مرحلة العصف الذهني) ويعيد التقييمات بنفس الترتيب.
+        """
+        logger.info(f"Reviewing {len(ideas)} ideas...")
+        return [self._review(idea.get("premise", "")) for idea in ideas]
 
+    def _review(self, premise: str) -> Dict[str, Any]:
+        score, issues, summary = self._verdict(self._premise_flags(premise))
         return {
-            "overall_score": max(min(score, 10.0), 0.0),
-            "issues": issues, # سيتم استخدامها كـ feedback
-            "summary": f"التقييم: {max(min(score, 10.0), 0.0):.1f}/10. {'فكرة واعدة.' if not issues else 'تحتاج الفكرة إلى تطوير.'}"
+            "overall_score": score,
+            "issues": list(issues), # سيتم استخدامها كـ feedback
+            "summary": summary
         }
+
+    @classmethod
+    def _premise_flags(cls, premise: str) -> Tuple[bool, ...]:
+        """يحسب لكل قاعدة في _RULES ما إذا كانت تنطبق على الفكرة."""
+        keywords, _, _ = _KEYWORD_SCANNER.scan(premise)
+        # العد يتوقف عند الحد الأدنى بدل تقسيم الفكرة كلها إلى قائمة كلمات
+        word_count = sum(1 for _ in islice(_WORD_RE.finditer(premise), _MIN_PREMISE_WORDS))
+        return tuple(
+            bool(present and keywords.keys() & present) or bool(absent and not keywords.keys() & absent)
+            or word_count < min_words
+            for present, absent, min_words, _, _ in cls._RULES
+        )
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _verdict(cls, flags: Tuple[bool, ...]) -> Tuple[float, Tuple[str, ...], str]:
+        """
+        التقييم يتحدد كليًا بأعلام القواعد، فعدد النتائج الممكنة محدود.
+        تُحسب كل نتيجة مرة واحدة ثم تُعاد مباشرة لبقية الأفكار.
+        """
+        score = 10.0
+        issues = []
+        for applies, (_, _, _, penalty, message) in zip(flags, cls._RULES):
+            if applies:
+                score -= penalty
+                issues.append(message)
+
+        score = max(min(score, 10.0), 0.0)
+        summary = f"التقييم: {score:.1f}/10. {'فكرة واعدة.' if not issues else 'تحتاج الفكرة إلى تطوير.'}"
+        return score, tuple(issues), summary
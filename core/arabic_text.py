@@ -0,0 +1,49 @@
+# core/arabic_text.py
+"""
+أدوات مشتركة لمعالجة النص العربي بين الوكلاء.
+"""
+import re
+from collections import Counter
+from typing import Dict, FrozenSet, List, Tuple
+
+# جدول توحيد الكتابة العربية: توحيد الهمزات والألف المقصورة والتاء المربوطة وحذف التشكيل والتطويل.
+# str.translate يطبّقه في مرور واحد بدل سلسلة من text.replace.
+_NORMALIZE = str.maketrans({
+    "أ": "ا", "إ": "ا", "آ": "ا", "ى": "ي", "ة": "ه",
+    **{chr(c): None for c in range(0x064B, 0x0653)},  # الحركات والتنوين والشدة والسكون
+    "\u0640": None,  # التطويل
+})
+
+def normalize_arabic(text: str) -> str:
+    """يوحد الكتابة العربية حتى تتطابق الصيغ التي لا تختلف إلا في الهمزات أو التشكيل أو التطويل."""
+    return text.translate(_NORMALIZE)
+
+class KeywordScanner:
+    """
+    كل الكلمات المفتاحية لكل المجموعات في نمط واحد، فيُمسح النص مرة واحدة فقط
+    مهما زاد عدد الكلمات، ثم تقرأ الفحوص نتائجها من العدادات.
+    البحث الاستباقي (lookahead) يلتقط التطابقات المتداخلة، والأطول يُجرَّب أولاً.
+    """
+    __slots__ = ('pattern', 'prefixes', 'keyword_groups', 'positional_groups')
+
+    def __init__(self, groups: Dict[str, FrozenSet[str]], positional_groups: Tuple[str, ...] = ()):
+        ordered = sorted({k for words in groups.values() for k in words}, key=len, reverse=True)
+        self.pattern = re.compile("(?=(" + "|".join(map(re.escape, ordered)) + "))")
+        # الكلمة الأطول المطابقة تعني أيضًا تطابق كل كلمة مفتاحية هي بادئة لها
+        self.prefixes = {k: tuple(p for p in ordered if k.startswith(p)) for k in ordered}
+        self.keyword_groups = {k: tuple(g for g, words in groups.items() if k in words) for k in ordered}
+        # المجموعات التي تحتاج مواضع التطابق وليس عددها فقط
+        self.positional_groups = positional_groups
+
+    def scan(self, text: str) -> Tuple[Counter, Counter, Dict[str, List[int]]]:
+        """يعيد عدد تطابقات كل كلمة، وعدد تطابقات كل مجموعة، ومواضع تطابق المجموعات الموضعية"""
+        keyword_hits, group_hits = Counter(), Counter()
+        positions = {g: [] for g in self.positional_groups}
+        for match in self.pattern.finditer(text):
+            for keyword in self.prefixes[match.group(1)]:
+                keyword_hits[keyword] += 1
+                for group in self.keyword_groups[keyword]:
+                    group_hits[group] += 1
+                    if group in positions:
+                        positions[group].append(match.start())
+        return keyword_hits, group_hits, positions
@@ -0,0 +1,30 @@
+# core/concurrency.py
+"""
+أدوات تزامن مشتركة بين الوكلاء.
+"""
+import asyncio
+import weakref
+
+class LoopBoundSemaphore:
+    """
+    سقف تزامن يصلح للتعريف عند تحميل الوحدة أو داخل وكيل وحيد (singleton).
+    asyncio.Semaphore في Python 3.9 يرتبط بحلقة الأحداث الحالية لحظة إنشائه، فيفشل
+    ("attached to a different loop") عند استخدامه من حلقة أخرى كالتي ينشئها asyncio.run.
+    هنا يُنشأ Semaphore فعلي عند أول استخدام داخل كل حلقة أحداث.
+    """
+    def __init__(self, value: int):
+        self._value = value
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+    def _current(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self._value)
+        return semaphore
+
+    async def __aenter__(self) -> None:
+        await self._current().acquire()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self._current().release()
@@ -0,0 +1,158 @@
+# core/llm_cache.py
+"""
+ذاكرة تخزين مؤقت لردود نماذج اللغة (LLM).
+تسمح للوكلاء بإعادة استخدام رد سابق عندما يصل نفس الطلب مرة أخرى،
+بما في ذلك النسخ التي لا تختلف إلا في المسافات والتنسيق.
+"""
+import asyncio
+import copy
+import hashlib
+import logging
+import re
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger("LLMCache")
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+def normalize_text(text: str) -> str:
+    """يوحد المسافات حتى تتطابق النصوص التي لا تختلف إلا في التنسيق."""
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+@lru_cache(maxsize=256)
+def content_digest(text: str) -> str:
+    """
+    بصمة ثابتة الطول لمحتوى نصي بعد توحيده، تصلح كجزء من مفتاح التخزين.
+    محفوظة مؤقتًا: نفس الدرس أو المشهد يُطلب عادةً بعدة مستويات صعوبة وأنواع تمارين.
+    """
+    return hashlib.blake2b(normalize_text(text).encode("utf-8"), digest_size=16).hexdigest()
+
+def request_key(prompt: str, temperature: float) -> bytes:
+    """مفتاح مضغوط لطلب LLM يجمع بين نص الـ prompt ودرجة الحرارة."""
+    return hashlib.blake2b(f"{temperature}|{prompt}".encode("utf-8"), digest_size=16).digest()
+
+class ResponseCache:
+    """
+    ذاكرة LRU محدودة الحجم مع مدة صلاحية (TTL) لكل مدخل.
+    القيم تُنسخ نسخًا عميقًا عند التخزين وعند الإرجاع، فتعديل المستدعي لنتيجته لا يصل إلى المخزن.
+    """
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = 3600.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def _lookup(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        stored_at, value = entry
+        if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        value = self._lookup(key)
+        return None if value is None else copy.deepcopy(value)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """فحص وجود مدخل صالح دون نسخ قيمته."""
+        return self._lookup(key) is not None
+
+    def set(self, key: Hashable, value: Any, low_priority: bool = False) -> None:
+        """
+        يخزن قيمة. المدخلات منخفضة الأولوية (مثل نتائج الجلب المسبق) توضع
+        في مقدمة طابور الإخلاء فتُحذف أولاً عند امتلاء الذاكرة.
+        """
+        self._entries.pop(key, None)
+        # الإخلاء يسبق الإدراج، وإلا لكان المدخل منخفض الأولوية الجديد نفسه أول ما يُحذف
+        while self._entries and len(self._entries) >= self.max_entries:
+            self._entries.popitem(last=False)
+        self._entries[key] = (time.monotonic(), copy.deepcopy(value))
+        self._entries.move_to_end(key, last=not low_priority)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+# إشارة للمنتظرين بأن المنفذ أُلغي قبل الحصول على نتيجة، فيعيدون المحاولة بأنفسهم
+_RETRY = object()
+
+class SingleFlight:
+    """
+    يدمج الطلبات المتطابقة المتزامنة: أول مستدعٍ ينفذ الطلب فعليًا،
+    وكل من يصل بنفس المفتاح قبل انتهائه ينتظر النتيجة نفسها بدل إرسال طلب مكرر.
+    إلغاء المنفذ لا يُلغي المنتظرين: أحدهم يتولى تنفيذ الطلب بدلاً منه.
+    كل منتظر يحصل على نسخة عميقة من النتيجة، فلا يتشارك المستدعون نفس الكائن.
+    """
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._inflight.get(key)
+        while future is not None:
+            # shield: إلغاء أحد المنتظرين لا يلغي الطلب المشترك
+            result = await asyncio.shield(future)
+            if result is not _RETRY:
+                return copy.deepcopy(result)
+            future = self._inflight.get(key)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            future.set_result(_RETRY)
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # تفادي تحذير "exception was never retrieved" عند غياب المنتظرين
+            raise
+        except BaseException:
+            # KeyboardInterrupt و SystemExit وأمثالهما: يُلغى الطلب المشترك فلا يبقى المنتظرون معلّقين
+            future.cancel()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+# طبقة دمج مشتركة بين جميع الوكلاء
+llm_singleflight = SingleFlight()
+
+# ردود JSON منخفضة الحرارة شبه حتمية، فيصلح تخزينها مشتركًا بين الوكلاء
+_json_cache = ResponseCache(max_entries=2048, ttl=None)
+
+async def cached_json(prompt: str, temperature: float, ttl: Optional[float] = 3600.0, refresh: bool = False) -> Any:
+    """
+    يستدعي llm_service.generate_json_response مع تخزين الرد بمفتاح مشتق من الـ prompt ودرجة الحرارة.
+    الطلبات المتطابقة المتزامنة تُدمج في طلب واحد، وردود الخطأ لا تُخزن.
+    refresh=True يتجاهل الرد المخزن ويستبدله برد جديد.
+    لا يُستخدم للطلبات عالية الحرارة التي يُنتظر منها رد مختلف في كل مرة.
+    """
+    key = request_key(prompt, temperature)
+    entry = None if refresh else _json_cache.get(key)
+    if entry is not None:
+        expires_at, response = entry
+        if expires_at is None or time.monotonic() < expires_at:
+            return response
+
+    async def call():
+        # استيراد متأخر: وحدة التخزين لا ترتبط بخدمة LLM إلا عند أول استدعاء فعلي
+        from .llm_service import llm_service
+        return await llm_service.generate_json_response(prompt, temperature=temperature)
+
+    response = await llm_singleflight.do(key, call)
+    if not (isinstance(response, dict) and "error" in response):
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        _json_cache.set(key, (expires_at, response))
+    return response
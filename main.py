@@ -4,6 +4,12 @@ import argparse
 import json
 import logging
 
+try:
+    # اختياري: حلقة أحداث أسرع (libuv) لأن مسارات الوكلاء تنتظر الشبكة في الغالب (LLM والبحث)
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # التأكد من أن جميع الوحدات والوكلاء يتم استيرادهم ليتم تسجيلهم
 from core.core_orchestrator import core_orchestrator
 
@@ -65,6 +71,8 @@ async def main():
         print(json.dumps(status, indent=2, ensure_ascii=False))
         
 if __name__ == "__main__":
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
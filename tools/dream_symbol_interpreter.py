@@ -4,6 +4,15 @@ from typing import Dict, Any
 
 logger = logging.getLogger("DreamSymbolInterpreter")
 
+# جدول الرموز يُبنى مرة واحدة عند تحميل الوحدة بدلاً من إعادة إنشائه في كل استدعاء
+_SYMBOL_TABLE: Dict[str, str] = {
+    "الصحراء": "ترمز إلى الضياع أو البحث الروحي.",
+    "الماء": "يرمز إلى الحياة، العواطف، أو اللاوعي.",
+    "الطيران": "يرمز إلى الحرية أو الهروب من الواقع."
+}
+
+_NARRATIVE_FUNCTION = "يعكس الحلم الصراع الداخلي للشخصية ويمهد لتحول قادم."
+
 class DreamSymbolInterpreter:
     def __init__(self):
         logger.info("DreamSymbolInterpreter initialized.")
@@ -13,12 +22,8 @@ class DreamSymbolInterpreter:
         
         dream = {
             "dream_content": content,
-            "symbols": {
-                "الصحراء": "ترمز إلى الضياع أو البحث الروحي.",
-                "الماء": "يرمز إلى الحياة، العواطف، أو اللاوعي.",
-                "الطيران": "يرمز إلى الحرية أو الهروب من الواقع."
-            },
-            "narrative_function": "يعكس الحلم الصراع الداخلي للشخصية ويمهد لتحول قادم."
+            "symbols": dict(_SYMBOL_TABLE),  # نسخة لكل مستدعٍ حتى لا يُعدل الجدول المشترك
+            "narrative_function": _NARRATIVE_FUNCTION
         }
         
         return {